@@ -6,11 +6,23 @@ import aiohttp
 import asyncio
 from datetime import datetime
 import sys
-from typing import Dict, Optional, Any, List
+from typing import Dict, Optional, Any, List, Tuple, Callable, Iterable
 import logging
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import time
 import re
+import json
+from urllib.parse import quote
+
+try:
+    import aiosqlite
+except ImportError:  # Persistent cache tier and local catalog are optional
+    aiosqlite = None
+
+if aiosqlite is not None:
+    from cogs.catalog import CatalogIndex
+
+from cogs.http_client import HTTPPool
 
 # Configure logging
 logging.basicConfig(
@@ -26,42 +38,606 @@ logging.getLogger('discord').setLevel(logging.WARNING)
 load_dotenv()
 
 class APICache:
-    """Cache manager for API data with TTL."""
-    def __init__(self, ttl_seconds: int = 3600):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    """Bounded LRU cache for API data with per-endpoint-class TTLs."""
+
+    # Core entries the bot always needs; never evicted by the LRU
+    PINNED_CLASSES = {'stats', 'platforms', 'user_count'}
+
+    def __init__(self, ttl_seconds: int = 3600, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024,
+                 class_ttls: Optional[Dict[str, int]] = None, stale_ttl: int = 0):
+        self.cache: "OrderedDict[str, Any]" = OrderedDict()
         self.ttl = ttl_seconds
-        self.last_fetch: Dict[str, float] = defaultdict(float)
+        self.class_ttls = class_ttls or {}
+        self.stale_ttl = stale_ttl  # How long past expiry an entry may still be served
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.last_fetch: Dict[str, float] = {}
+        self.sizes: Dict[str, int] = {}
+        self.total_bytes = 0
+        self.stats: Dict[str, int] = defaultdict(int)
+        self.hit_counts: Dict[str, int] = defaultdict(int)  # Hits since the entry was last stored
+
+    @staticmethod
+    def endpoint_class(endpoint: str) -> str:
+        """Classify an endpoint, e.g. 'roms/12' -> 'rom', 'roms?search_term=x' -> 'search'."""
+        path = endpoint.split('?', 1)[0].strip('/')
+        if path.startswith('roms/'):
+            return 'rom'
+        if path == 'roms':
+            return 'search'
+        return path
+
+    def ttl_for(self, endpoint: str) -> int:
+        """Get the TTL that applies to an endpoint."""
+        return self.class_ttls.get(self.endpoint_class(endpoint), self.ttl)
+
+    def age(self, endpoint: str) -> float:
+        """Seconds since the endpoint was last stored."""
+        return time.time() - self.last_fetch.get(endpoint, 0)
 
     def is_fresh(self, endpoint: str) -> bool:
         """Check if cached data is still fresh."""
-        return time.time() - self.last_fetch.get(endpoint, 0) < self.ttl
+        return endpoint in self.cache and self.age(endpoint) < self.ttl_for(endpoint)
 
     def get(self, endpoint: str) -> Optional[Dict[str, Any]]:
         """Get cached data if fresh."""
-        return self.cache.get(endpoint) if self.is_fresh(endpoint) else None
+        if not self.is_fresh(endpoint):
+            return None
+        self.cache.move_to_end(endpoint)
+        return self.cache[endpoint]
+
+    def lookup(self, endpoint: str) -> Tuple[Optional[Any], bool]:
+        """Get cached data and whether it is fresh. Stale data is returned while within the stale window."""
+        if endpoint not in self.cache:
+            self.stats['misses'] += 1
+            return None, False
+
+        age = self.age(endpoint)
+        ttl = self.ttl_for(endpoint)
+        if age < ttl:
+            self.stats['hits'] += 1
+            self.hit_counts[endpoint] += 1
+            self.cache.move_to_end(endpoint)
+            return self.cache[endpoint], True
+        if age < ttl + self.stale_ttl:
+            self.stats['stale_hits'] += 1
+            self.cache.move_to_end(endpoint)
+            return self.cache[endpoint], False
+
+        # Too old to be useful, drop it
+        self.stats['misses'] += 1
+        self.invalidate(endpoint)
+        return None, False
+
+    def peek(self, endpoint: str) -> Optional[Any]:
+        """Get cached data regardless of age, for answering while the API is unreachable."""
+        if endpoint not in self.cache:
+            self.stats['misses'] += 1
+            return None
+        self.stats['degraded_hits'] += 1
+        self.cache.move_to_end(endpoint)
+        return self.cache[endpoint]
 
-    def set(self, endpoint: str, data: Dict[str, Any]):
-        """Set cache data with current timestamp."""
+    def set(self, endpoint: str, data: Any, size: Optional[int] = None, timestamp: Optional[float] = None):
+        """Set cache data with current timestamp (or the given one) and enforce the bounds."""
+        if size is None:
+            size = self.estimate_size(data)
+        if endpoint in self.cache:
+            self.total_bytes -= self.sizes.get(endpoint, 0)
         self.cache[endpoint] = data
-        self.last_fetch[endpoint] = time.time()
+        self.cache.move_to_end(endpoint)
+        self.sizes[endpoint] = size
+        self.total_bytes += size
+        self.hit_counts.pop(endpoint, None)
+        self.last_fetch[endpoint] = timestamp if timestamp is not None else time.time()
+        self._enforce_bounds()
+
+    def touch(self, endpoint: str):
+        """Mark cached data as freshly validated without replacing it."""
+        if endpoint in self.cache:
+            self.last_fetch[endpoint] = time.time()
+            self.cache.move_to_end(endpoint)
+
+    def invalidate(self, endpoint: str):
+        """Remove an endpoint from the cache."""
+        if endpoint in self.cache:
+            del self.cache[endpoint]
+            self.total_bytes -= self.sizes.pop(endpoint, 0)
+            self.last_fetch.pop(endpoint, None)
+            self.hit_counts.pop(endpoint, None)
+
+    def _enforce_bounds(self):
+        """Evict least recently used entries until both the entry and byte limits are respected."""
+        if len(self.cache) <= self.max_entries and self.total_bytes <= self.max_bytes:
+            return
+        for endpoint in list(self.cache.keys()):
+            if len(self.cache) <= self.max_entries and self.total_bytes <= self.max_bytes:
+                break
+            if self.endpoint_class(endpoint) in self.PINNED_CLASSES:
+                continue
+            self.invalidate(endpoint)
+            self.stats['evictions'] += 1
+
+    @staticmethod
+    def estimate_size(data: Any) -> int:
+        """Rough size of a JSON payload in bytes."""
+        try:
+            return len(json.dumps(data, default=str))
+        except (TypeError, ValueError):
+            return sys.getsizeof(data)
+
+class PersistentCache:
+    """Optional SQLite-backed second cache tier so the bot starts warm after a restart."""
+    def __init__(self, db_path: str = "data/api_cache.db", max_roms: int = 500):
+        self.db_path = db_path
+        self.max_roms = max_roms
+        self._initialized = False
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+    async def initialize(self):
+        """Create the cache table if it doesn't exist."""
+        if self._initialized:
+            return
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    endpoint TEXT PRIMARY KEY,
+                    endpoint_class TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+            """)
+            await db.commit()
+        self._initialized = True
+
+    async def load(self, max_age: float) -> List[Tuple[str, Any, float]]:
+        """Load all persisted entries newer than max_age seconds."""
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("DELETE FROM api_cache WHERE fetched_at < ?", (time.time() - max_age,))
+            await db.commit()
+            async with db.execute("SELECT endpoint, data, fetched_at FROM api_cache") as cursor:
+                rows = await cursor.fetchall()
+
+        entries = []
+        for endpoint, data, fetched_at in rows:
+            try:
+                entries.append((endpoint, json.loads(data), fetched_at))
+            except ValueError:
+                logger.warning(f"Skipping corrupt persisted cache entry for {endpoint}")
+        return entries
+
+    async def save(self, entries: List[Tuple[str, Any, float]]):
+        """Persist (endpoint, data, fetched_at) entries, keeping only the most recent ROM details."""
+        if not entries:
+            return
+        await self.initialize()
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.executemany(
+                "INSERT OR REPLACE INTO api_cache (endpoint, endpoint_class, data, fetched_at) VALUES (?, ?, ?, ?)",
+                [
+                    (endpoint, APICache.endpoint_class(endpoint), json.dumps(data), fetched_at)
+                    for endpoint, data, fetched_at in entries
+                ]
+            )
+            await db.execute(
+                """
+                DELETE FROM api_cache WHERE endpoint_class = 'rom' AND endpoint NOT IN (
+                    SELECT endpoint FROM api_cache WHERE endpoint_class = 'rom'
+                    ORDER BY fetched_at DESC LIMIT ?
+                )
+                """,
+                (self.max_roms,)
+            )
+            await db.commit()
+
+class RomDetailCache:
+    """Bounded LRU of ROM details by id, dropped per ROM or per platform when RomM rescans them."""
+    def __init__(self, max_entries: int = 1000, ttl_seconds: int = 1800):
+        self.entries: "OrderedDict[int, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self.platform_roms: Dict[int, set] = defaultdict(set)
+        self.hit_counts: Dict[int, int] = defaultdict(int)
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, rom_id: int) -> Optional[Dict[str, Any]]:
+        """Get a ROM's details if cached and not older than the TTL."""
+        entry = self.entries.get(rom_id)
+        if entry is None or time.time() - entry[1] >= self.ttl:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        self.hit_counts[rom_id] += 1
+        self.entries.move_to_end(rom_id)
+        return entry[0]
+
+    def set(self, rom: Dict[str, Any]):
+        """Store a ROM's details, evicting the least recently viewed ROMs past the bound."""
+        rom_id = rom.get('id')
+        if rom_id is None:
+            return
+        self.invalidate(rom_id)
+        self.entries[rom_id] = (rom, time.time())
+        self.platform_roms[rom.get('platform_id')].add(rom_id)
+        while len(self.entries) > self.max_entries:
+            oldest = next(iter(self.entries))
+            self.invalidate(oldest)
+            self.stats['evictions'] += 1
+
+    def invalidate(self, rom_id: int) -> bool:
+        """Drop one ROM. Returns whether it was cached."""
+        entry = self.entries.pop(rom_id, None)
+        self.hit_counts.pop(rom_id, None)
+        if entry is None:
+            return False
+        platform_id = entry[0].get('platform_id')
+        self.platform_roms[platform_id].discard(rom_id)
+        if not self.platform_roms[platform_id]:
+            del self.platform_roms[platform_id]
+        return True
+
+    def invalidate_platform(self, platform_id: int) -> List[int]:
+        """Drop every cached ROM of a platform and return their ids."""
+        rom_ids = list(self.platform_roms.get(platform_id, ()))
+        for rom_id in rom_ids:
+            self.invalidate(rom_id)
+        return rom_ids
+
+    def clear(self):
+        self.entries.clear()
+        self.platform_roms.clear()
+        self.hit_counts.clear()
+
+class SearchResultCache:
+    """Short-lived cache of API search pages keyed by platform and normalized search term.
+
+    "Mario", "mario " and "MARIO" share one entry, and a finished scan drops every
+    entry of the platforms it touched.
+    """
+    def __init__(self, ttl_seconds: int = 120, max_entries: int = 256):
+        self.entries: "OrderedDict[Tuple[int, str, int, int], Tuple[List[Dict], float]]" = OrderedDict()
+        self.platform_keys: Dict[int, set] = defaultdict(set)
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self.stats: Dict[str, int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @staticmethod
+    def normalize(term: str) -> str:
+        """Case- and whitespace-insensitive form of a search term."""
+        return ' '.join(term.lower().split())
+
+    def get(self, platform_id: int, term: str, offset: int = 0, limit: int = 25) -> Optional[List[Dict]]:
+        """Get a page of results if cached and not older than the TTL."""
+        key = (platform_id, self.normalize(term), offset, limit)
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry[1] >= self.ttl:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def peek(self, platform_id: int, term: str, offset: int = 0, limit: int = 25) -> Optional[List[Dict]]:
+        """Get a page of results regardless of age, for answering while the API is unreachable."""
+        entry = self.entries.get((platform_id, self.normalize(term), offset, limit))
+        if entry is None:
+            return None
+        self.stats['degraded_hits'] += 1
+        return entry[0]
+
+    def set(self, platform_id: int, term: str, offset: int, limit: int, results: List[Dict]):
+        """Store a page of results, evicting the least recently used pages past the bound."""
+        key = (platform_id, self.normalize(term), offset, limit)
+        self.entries[key] = (results, time.time())
+        self.entries.move_to_end(key)
+        self.platform_keys[platform_id].add(key)
+        while len(self.entries) > self.max_entries:
+            self._drop(next(iter(self.entries)))
+            self.stats['evictions'] += 1
+
+    def _drop(self, key: Tuple[int, str, int, int]):
+        self.entries.pop(key, None)
+        keys = self.platform_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.platform_keys[key[0]]
+
+    def invalidate_platform(self, platform_id: int) -> int:
+        """Drop every cached page of a platform and return how many there were."""
+        keys = list(self.platform_keys.get(platform_id, ()))
+        for key in keys:
+            self._drop(key)
+        self.stats['invalidations'] += len(keys)
+        return len(keys)
+
+    def clear(self):
+        self.stats['invalidations'] += len(self.entries)
+        self.entries.clear()
+        self.platform_keys.clear()
+
+class UserIndex:
+    """Locally kept RomM user index, rebuilt rarely and patched as the bot creates or deletes users."""
+    def __init__(self, refresh_interval: int = 86400):
+        self.refresh_interval = refresh_interval
+        self.users: Dict[int, str] = {}  # user id -> username
+        self._usernames: Dict[str, int] = {}  # lowercased username -> user id
+        self.last_refresh: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    @property
+    def loaded(self) -> bool:
+        return self.last_refresh is not None
+
+    def needs_refresh(self) -> bool:
+        return not self.loaded or time.time() - self.last_refresh >= self.refresh_interval
+
+    def rebuild(self, users: List[Dict]):
+        """Replace the index with a full users listing."""
+        self.users.clear()
+        self._usernames.clear()
+        for user in users:
+            self.add(user)
+        self.last_refresh = time.time()
+
+    def add(self, user: Dict):
+        user_id = user.get('id')
+        username = user.get('username', '')
+        if user_id is None:
+            return
+        previous = self.users.get(user_id)
+        if previous is not None:
+            self._usernames.pop(previous.lower(), None)
+        self.users[user_id] = username
+        self._usernames[username.lower()] = user_id
+
+    def remove(self, user_id: int):
+        username = self.users.pop(user_id, None)
+        if username is not None:
+            self._usernames.pop(username.lower(), None)
+
+    def has_username(self, username: str) -> bool:
+        return username.lower() in self._usernames
+
+    def find_id(self, username: str) -> Optional[int]:
+        return self._usernames.get(username.lower())
+
+class PlatformIndex:
+    """Platforms keyed by id, lowercase name and slug, rebuilt once per platforms refresh.
+
+    Display strings ("Name <emoji>") are precomputed with the formatter the Search cog
+    registers once its emoji mappings are ready.
+    """
+    def __init__(self):
+        self.platforms: List[Dict] = []
+        self.by_id: Dict[int, Dict] = {}
+        self.by_name: Dict[str, Dict] = {}
+        self.by_slug: Dict[str, Dict] = {}
+        self.display_names: Dict[str, str] = {}
+        self.sorted_names: List[str] = []
+        self.available_list = ""
+        self._formatter: Optional[Callable[[str], str]] = None
+
+    def __len__(self) -> int:
+        return len(self.platforms)
+
+    def rebuild(self, raw_platforms: List[Dict]):
+        """Index a platforms listing, raw or already sanitized."""
+        platforms = []
+        for platform in raw_platforms:
+            if not isinstance(platform, dict) or not platform.get("name") or not platform.get("rom_count"):
+                continue
+            entry = {
+                "id": platform.get("id", 0),
+                "name": platform["name"],
+                "rom_count": platform["rom_count"]
+            }
+            if platform.get("slug"):
+                entry["slug"] = platform["slug"]
+            platforms.append(entry)
+
+        self.platforms = platforms
+        self.by_id = {p["id"]: p for p in platforms}
+        self.by_name = {p["name"].lower(): p for p in platforms}
+        self.by_slug = {p["slug"].lower(): p for p in platforms if "slug" in p}
+        self.sorted_names = sorted(self.by_name[name]["name"] for name in self.by_name)
+        self._build_display()
+
+    def set_display_formatter(self, formatter: Callable[[str], str]):
+        """Register how platform names are decorated and recompute the display strings."""
+        self._formatter = formatter
+        self._build_display()
+
+    def _build_display(self):
+        self.display_names = {}
+        self.refresh_display(platform["name"] for platform in self.platforms)
+
+    def refresh_display(self, platform_names: Iterable[str]):
+        """Recompute the display strings of some platforms, e.g. after their emoji changed."""
+        formatter = self._formatter or (lambda name: name)
+        for name in platform_names:
+            if name.lower() not in self.by_name:
+                continue
+            try:
+                self.display_names[name] = formatter(name)
+            except Exception as e:
+                logger.error(f"Error formatting platform {name}: {e}")
+                self.display_names[name] = name
+        self.available_list = "\n".join(f"• {self.display(name)}" for name in self.sorted_names)
+
+    def get(self, platform_id: int) -> Optional[Dict]:
+        return self.by_id.get(platform_id)
+
+    def find(self, query: str) -> Optional[Dict]:
+        """Look a platform up by name or slug, ignoring case."""
+        if not query:
+            return None
+        key = query.strip().lower()
+        return self.by_name.get(key) or self.by_slug.get(key)
+
+    def display(self, platform_name: str) -> str:
+        """Platform name with its emoji, formatting names outside the index on the fly."""
+        display = self.display_names.get(platform_name)
+        if display is None:
+            display = self._formatter(platform_name) if self._formatter and platform_name else platform_name
+        return display
+
+class TokenBucket:
+    """Token bucket that refills continuously and serves waiters in FIFO order."""
+    def __init__(self, calls: int, period: float = 60):
+        self.capacity = calls
+        self.rate = calls / period  # Tokens per second
+        self.tokens = float(calls)
+        self.updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        # Metrics
+        self.waiting = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Take one token, waiting for a refill if the bucket is empty."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()  # asyncio.Lock wakes waiters in FIFO order
+        start = time.monotonic()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                self._refill()
+                if self.tokens < 1:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+                    self._refill()
+                self.tokens -= 1
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
 
 class RateLimit:
-    """Rate limit manager for Discord API calls."""
+    """Rate limit manager for Discord API calls, with one token bucket per route or resource."""
+
+    # (calls, period in seconds) per route; routes not listed use calls_per_minute
+    ROUTE_LIMITS = {
+        'channel_edit': (2, 600),  # Discord allows 2 channel renames per 10 minutes per channel
+        'presence': (5, 60),
+        'channel_create': (30, 60),
+        'channel_delete': (30, 60),
+    }
+
     def __init__(self, calls_per_minute: int = 30):
         self.calls_per_minute = calls_per_minute
-        self.calls: list[float] = []
+        self.buckets: Dict[str, TokenBucket] = {}
 
-    async def acquire(self):
+    def bucket(self, route: str) -> TokenBucket:
+        """Get the bucket for a route key such as 'channel_edit:<channel id>'."""
+        bucket = self.buckets.get(route)
+        if bucket is None:
+            calls, period = self.ROUTE_LIMITS.get(route.split(':', 1)[0], (self.calls_per_minute, 60))
+            bucket = self.buckets[route] = TokenBucket(calls, period)
+        return bucket
+
+    async def acquire(self, route: str = 'global'):
         """Wait if necessary to respect rate limits."""
-        now = time.time()
-        self.calls = [t for t in self.calls if now - t < 60]  # Clean old calls
-        
-        if len(self.calls) >= self.calls_per_minute:
-            wait_time = 60 - (now - self.calls[0])
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-        
-        self.calls.append(now)
+        await self.bucket(route).acquire()
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Queue depth and wait times per bucket."""
+        return {
+            route: {
+                'queued': bucket.waiting,
+                'acquired': bucket.acquired,
+                'avg_wait': bucket.total_wait / bucket.acquired if bucket.acquired else 0.0,
+                'max_wait': bucket.max_wait
+            }
+            for route, bucket in self.buckets.items()
+        }
+
+class CircuitBreaker:
+    """Circuit breaker for the RomM API.
+
+    Opens after failure_threshold consecutive failures so callers fail fast instead of
+    waiting out the timeout. Once open, a single half-open probe is let through after
+    reset_timeout, doubling up to max_reset_timeout while probes keep failing.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30, max_reset_timeout: float = 600,
+                 on_state_change=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.on_state_change = on_state_change
+        self.state = self.CLOSED
+        self.failures = 0
+        self.current_timeout = reset_timeout
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        previous, self.state = self.state, state
+        logger.warning(f"RomM circuit breaker {previous} -> {state}")
+        if self.on_state_change:
+            self.on_state_change(state)
+
+    def retry_in(self) -> float:
+        """Seconds until the next half-open probe is allowed."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(self.opened_at + self.current_timeout - time.monotonic(), 0.0)
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self.retry_in() <= 0:
+            self._transition(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.current_timeout = self.reset_timeout
+        self._probe_in_flight = False
+        self._transition(self.CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            # Probe failed, back off further before the next one
+            self.current_timeout = min(self.current_timeout * 2, self.max_reset_timeout)
+        elif self.failures < self.failure_threshold:
+            return
+        self._probe_in_flight = False
+        self.opened_at = time.monotonic()
+        self._transition(self.OPEN)
+
+    def release_probe(self):
+        """Give the half-open probe slot back when the probe was cancelled before RomM answered."""
+        self._probe_in_flight = False
 
 class Config:
     """Configuration manager with validation."""
@@ -75,7 +651,27 @@ class Config:
         self.UPDATE_VOICE_NAMES = os.getenv('UPDATE_VOICE_NAMES', 'true').lower() == 'true'
         self.SHOW_API_SUCCESS = os.getenv('SHOW_API_SUCCESS', 'false').lower() == 'true'
         self.CACHE_TTL = int(os.getenv('CACHE_TTL', 3900))  # 65 minutes default
+        self.CACHE_TTL_ROM = int(os.getenv('CACHE_TTL_ROM', 1800))  # 30 minutes default
+        self.CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 512))
+        self.ROM_CACHE_SIZE = int(os.getenv('ROM_CACHE_SIZE', 1000))  # ROM details kept in memory
+        self.SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 120))  # 2 minutes default
+        self.SEARCH_CACHE_SIZE = int(os.getenv('SEARCH_CACHE_SIZE', 256))  # Search result pages kept in memory
+        self.CACHE_MAX_MB = int(os.getenv('CACHE_MAX_MB', 32))
+        self.CACHE_STALE_TTL = int(os.getenv('CACHE_STALE_TTL', 86400))  # Serve stale data up to 1 day past expiry
+        self.STALE_WHILE_REVALIDATE = os.getenv('STALE_WHILE_REVALIDATE', 'true').lower() == 'true'
+        self.PERSIST_CACHE = os.getenv('PERSIST_CACHE', 'true').lower() == 'true'
         self.API_TIMEOUT = int(os.getenv('API_TIMEOUT', 10))  # 10 seconds default
+        self.SYNC_DEADLINE = int(os.getenv('SYNC_DEADLINE', self.API_TIMEOUT * 2))  # Shared deadline for one sync tick
+        self.CATALOG_ENABLED = os.getenv('CATALOG_ENABLED', 'true').lower() == 'true'
+        self.CATALOG_MAX_AGE = int(os.getenv('CATALOG_MAX_AGE', 86400))  # Full re-sync of each platform once a day
+        self.CATALOG_PAGE_SIZE = int(os.getenv('CATALOG_PAGE_SIZE', 1000))  # ROMs per request during a catalog sync
+        self.SEARCH_BUDGET = float(os.getenv('SEARCH_BUDGET', 5))  # Seconds an all-platform search may take
+        self.SEARCH_CONCURRENCY = int(os.getenv('SEARCH_CONCURRENCY', 4))  # Parallel API searches across platforms
+        self.BREAKER_FAILURES = int(os.getenv('BREAKER_FAILURES', 3))  # Consecutive failures before failing fast
+        self.BREAKER_RESET = int(os.getenv('BREAKER_RESET', 30))  # Seconds before the first recovery probe
+        self.HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 2))  # Retries for idempotent requests
+        self.USER_INDEX_REFRESH = int(os.getenv('USER_INDEX_REFRESH', 86400))  # Full user list refresh, 1 day default
+        self.QR_CACHE_MB = int(os.getenv('QR_CACHE_MB', 4))  # Rendered QR code PNGs kept in memory
         self.USER = os.getenv('USER')
         self.PASS = os.getenv('PASS')
         requests_env = os.getenv('REQUESTS_ENABLED', 'TRUE').upper()
@@ -99,6 +695,14 @@ class Config:
 
 class RommBot(discord.Bot):
     """Extended Discord bot with additional functionality."""
+
+    # Cache hits after which a ROM detail entry is persisted to disk
+    HOT_ROM_HITS = 2
+    # Endpoints whose ETag/Last-Modified validators are remembered for conditional GETs
+    MAX_VALIDATORS = 128
+    # Endpoints cached under their own name in sanitized form for the cogs; the raw payload lives under raw_key()
+    SANITIZED_ENDPOINTS = {'stats', 'platforms'}
+
     def __init__(self):
         intents = discord.Intents.default()
         intents.message_content = True
@@ -115,11 +719,60 @@ class RommBot(discord.Bot):
 
         # Initialize bot attributes    
         self.config = Config()
-        self.cache = APICache(self.config.CACHE_TTL)
+        self.cache = APICache(
+            self.config.CACHE_TTL,
+            max_entries=self.config.CACHE_MAX_ENTRIES,
+            max_bytes=self.config.CACHE_MAX_MB * 1024 * 1024,
+            class_ttls={
+                'rom': self.config.CACHE_TTL_ROM
+            },
+            stale_ttl=self.config.CACHE_STALE_TTL if self.config.STALE_WHILE_REVALIDATE else 0
+        )
+        # ROM details opened from /search and /random, invalidated by scan events
+        self.rom_cache = RomDetailCache(self.config.ROM_CACHE_SIZE, self.config.CACHE_TTL_ROM)
+        # API search pages by (platform, normalized term), dropped when that platform is rescanned
+        self.search_cache = SearchResultCache(self.config.SEARCH_CACHE_TTL, self.config.SEARCH_CACHE_SIZE)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background_tasks = set()
+        self.persistent_cache: Optional[PersistentCache] = None
+        if self.config.PERSIST_CACHE:
+            if aiosqlite is None:
+                logger.warning("aiosqlite is not installed, persistent API cache disabled")
+            else:
+                self.persistent_cache = PersistentCache()
+        self.api_metrics: Dict[str, int] = defaultdict(int)
+        # endpoint -> {'etag', 'last_modified', 'size'} for conditional GETs; the payload itself stays in self.cache
+        self._validators: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self.rate_limiter = RateLimit()
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=self.config.BREAKER_FAILURES,
+            reset_timeout=self.config.BREAKER_RESET,
+            on_state_change=lambda state: self.dispatch('romm_circuit_change', state)
+        )
+        self.platform_index = PlatformIndex()
+        self.catalog: Optional["CatalogIndex"] = None
+        if self.config.CATALOG_ENABLED:
+            if aiosqlite is None:
+                logger.warning("aiosqlite is not installed, local ROM catalog disabled")
+            else:
+                self.catalog = CatalogIndex(max_age=self.config.CATALOG_MAX_AGE)
+        self._catalog_sync_lock = asyncio.Lock()
+        self.user_index = UserIndex(self.config.USER_INDEX_REFRESH)
+        # None until probed; False once RomM is known not to report a total for users?limit=1
+        self._user_count_probe: Optional[bool] = None
         # self.stat_channels: Dict[str, discord.VoiceChannel] = {}
-        self.session: Optional[aiohttp.ClientSession] = None
-        self._session_lock = asyncio.Lock()
+        # Every cog shares this pool instead of opening its own sessions
+        self.http_pool = HTTPPool(
+            timeouts={'romm': self.config.API_TIMEOUT},
+            headers={
+                'romm': {
+                    "User-Agent": f"RommBot/1.0",  # Identify as bot in RomM logs
+                    "Accept": "application/json"
+                },
+                'igdb': {"Accept": "application/json"}
+            },
+            retries=self.config.HTTP_RETRIES
+        )
 
         # Add a commands sync flag
         self.synced = False
@@ -207,6 +860,43 @@ class RommBot(discord.Bot):
             except Exception as e:
                 logger.error(f"Failed to load extension {cog}", exc_info=True)
                 logger.error(f"Error details: {str(e)}")
+
+    async def start(self, token: str, *args, **kwargs):
+        """Warm the API cache from disk before connecting to Discord."""
+        await self.load_persistent_cache()
+        await super().start(token, *args, **kwargs)
+
+    async def load_persistent_cache(self):
+        """Seed the in-memory cache with persisted entries, keeping their original timestamps."""
+        if not self.persistent_cache:
+            return
+        try:
+            entries = await self.persistent_cache.load(max_age=self.config.CACHE_TTL + self.config.CACHE_STALE_TTL)
+            for endpoint, data, fetched_at in entries:
+                self.cache.set(endpoint, data, timestamp=fetched_at)
+            logger.info(f"Loaded {len(entries)} persisted cache entries")
+        except Exception as e:
+            logger.error(f"Error loading persistent cache: {e}")
+
+    async def persist_cache_entries(self, endpoints: List[str]):
+        """Write the current cached data for the given endpoints to disk."""
+        if not self.persistent_cache:
+            return
+        entries = [
+            (endpoint, self.cache.cache[endpoint], self.cache.last_fetch[endpoint])
+            for endpoint in endpoints if endpoint in self.cache.cache
+        ]
+        try:
+            await self.persistent_cache.save(entries)
+        except Exception as e:
+            logger.error(f"Error persisting cache entries {endpoints}: {e}")
+
+    def _track_task(self, coro) -> asyncio.Task:
+        """Run a fire-and-forget coroutine, keeping a reference until it finishes."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
   
     async def on_ready(self):
         """When bot is ready, start tasks."""
@@ -240,17 +930,8 @@ class RommBot(discord.Bot):
             self.update_loop.start()
                     
     async def ensure_session(self) -> aiohttp.ClientSession:
-        """Ensure an active session exists and return it."""
-        async with self._session_lock:
-            if self.session is None or self.session.closed:
-                self.session = aiohttp.ClientSession(
-                    timeout=aiohttp.ClientTimeout(total=self.config.API_TIMEOUT),
-                    headers={
-                        "User-Agent": f"RommBot/1.0",  # Identify as bot in RomM logs
-                        "Accept": "application/json"
-                    }
-                )
-            return self.session
+        """Return the pooled RomM session."""
+        return await self.http_pool.session('romm')
 
     @tasks.loop(seconds=300)  # Default to 5 minutes, will be updated in before_loop
     async def update_loop(self):
@@ -265,36 +946,143 @@ class RommBot(discord.Bot):
         self.update_loop.change_interval(seconds=self.config.SYNC_RATE)
         logger.info("Update loop initialized")
 
+    def _get_inflight(self, endpoint: str) -> asyncio.Future:
+        """Get the in-flight request for an endpoint, starting one if none is running."""
+        task = self._inflight.get(endpoint)
+        if task is not None:
+            self.api_metrics['coalesced'] += 1
+            return task
+
+        task = asyncio.ensure_future(self._request_endpoint(endpoint))
+        self._inflight[endpoint] = task
+
+        def _clear(done: asyncio.Future):
+            if self._inflight.get(endpoint) is done:
+                del self._inflight[endpoint]
+
+        task.add_done_callback(_clear)
+        return task
+
+    def _schedule_revalidation(self, endpoint: str):
+        """Refresh a stale cache entry in the background, at most once per endpoint."""
+        if endpoint not in self._inflight:
+            self._get_inflight(endpoint)
+
+    @property
+    def degraded(self) -> bool:
+        """True while RomM is considered unreachable and answers come from cached data."""
+        return self.circuit_breaker.state != CircuitBreaker.CLOSED
+
+    def raw_key(self, endpoint: str) -> str:
+        """Cache key of an endpoint's raw RomM payload, kept apart from any sanitized copy."""
+        return f'raw:{endpoint}' if endpoint in self.SANITIZED_ENDPOINTS else endpoint
+
     async def fetch_api_endpoint(self, endpoint: str, bypass_cache: bool = False) -> Optional[Dict]:
         """Fetch data from API with caching and error handling."""
+        key = self.raw_key(endpoint)
+        if self.circuit_breaker.state == CircuitBreaker.OPEN and self.circuit_breaker.retry_in() > 0:
+            # RomM is down: answer straight from whatever we still hold instead of waiting on a timeout
+            self.api_metrics['short_circuited'] += 1
+            return None if bypass_cache else self.cache.peek(key)
+
         # Bypass cache if specified
         if not bypass_cache:
-            cached_data = self.cache.get(endpoint)
+            cached_data, is_fresh = self.cache.lookup(key)
             if cached_data:
-                logger.info(f"Returning cached data for {endpoint}")
+                if is_fresh:
+                    logger.info(f"Returning cached data for {endpoint}")
+                    # ROM details that keep getting opened are worth keeping across restarts
+                    if (self.persistent_cache and self.cache.endpoint_class(endpoint) == 'rom'
+                            and self.cache.hit_counts[key] == self.HOT_ROM_HITS):
+                        self._track_task(self.persist_cache_entries([endpoint]))
+                    return cached_data
+                # Serve the stale entry right away and refresh it in the background
+                logger.info(f"Returning stale data for {endpoint} while revalidating")
+                self._schedule_revalidation(endpoint)
                 return cached_data
 
+        # Concurrent callers for the same endpoint share one request and one JSON decode.
+        # Shield it so a cancelled caller doesn't cancel the request for everyone else.
+        data = await asyncio.shield(self._get_inflight(endpoint))
+        if data is None and self.degraded and not bypass_cache:
+            return self.cache.peek(key)
+        return data
+
+    async def _romm_get(self, url: str, **kwargs) -> Optional[aiohttp.ClientResponse]:
+        """GET from RomM through the circuit breaker. Returns None without a request while it is open."""
+        if not self.circuit_breaker.allow_request():
+            self.api_metrics['short_circuited'] += 1
+            return None
+        try:
+            response = await self.http_pool.request('romm', 'GET', url, **kwargs)
+        except asyncio.CancelledError:
+            # A cancelled caller says nothing about RomM, but must not keep the probe slot
+            self.circuit_breaker.release_probe()
+            raise
+        except Exception:
+            self.circuit_breaker.record_failure()
+            raise
+        if response.status >= 500:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+        return response
+
+    async def _request_endpoint(self, endpoint: str) -> Optional[Dict]:
+        """Perform the actual API request for an endpoint and cache the raw result."""
+        self.api_metrics['requests'] += 1
+        key = self.raw_key(endpoint)
         try:
-            session = await self.ensure_session()
             url = f"{self.config.API_BASE_URL}/api/{endpoint}"
 
             # Basic authentication
             auth = aiohttp.BasicAuth(self.config.USER, self.config.PASS)
+
+            # Revalidate instead of re-downloading when we hold validators for this endpoint
+            headers = {}
+            validator = self._validators.get(endpoint)
+            if validator:
+                if validator['etag']:
+                    headers['If-None-Match'] = validator['etag']
+                if validator['last_modified']:
+                    headers['If-Modified-Since'] = validator['last_modified']
         
-            async with session.get(url, auth=auth) as response:
-                if response.status == 200:
-                    try:
-                        data = await response.json()
-                        logger.info(f"Fetched fresh data for {endpoint}")
-                        # Store data in cache after fetching fresh data
-                        if data:
-                            self.cache.set(endpoint, data)
-                        return data
-                    except Exception as e:
-                        logger.error(f"Error parsing JSON from {endpoint}: {e}")
-                else:
-                    logger.warning(f"API returned status {response.status} for endpoint {endpoint}")
+            response = await self._romm_get(url, auth=auth, headers=headers)
+            if response is None:
+                logger.info(f"Skipping request for {endpoint}, RomM circuit breaker is {self.circuit_breaker.state}")
                 return None
+            if response.status == 304 and validator:
+                # Only the raw copy can answer a 304; sanitized stats/platforms live under another key
+                if key in self.cache.cache:
+                    self.api_metrics['not_modified'] += 1
+                    self.api_metrics['bytes_saved_not_modified'] += validator['size']
+                    self._validators.move_to_end(endpoint)
+                    logger.info(f"Data for {endpoint} not modified")
+                    self.cache.touch(key)
+                    return self.cache.cache[key]
+                # The cached copy was evicted meanwhile, so the validators are useless: download it again
+                self._validators.pop(endpoint, None)
+                response = await self._romm_get(url, auth=auth)
+                if response is None:
+                    logger.info(f"Skipping request for {endpoint}, RomM circuit breaker is {self.circuit_breaker.state}")
+                    return None
+
+            if response.status == 200:
+                try:
+                    body = await response.read()
+                    data = json.loads(body)
+                    logger.info(f"Fetched fresh data for {endpoint}")
+                    self._record_transfer(response, len(body))
+                    self._store_validators(endpoint, response, len(body))
+                    # Store data in cache after fetching fresh data
+                    if data:
+                        self.cache.set(key, data, size=len(body))
+                    return data
+                except Exception as e:
+                    logger.error(f"Error parsing JSON from {endpoint}: {e}")
+            else:
+                logger.warning(f"API returned status {response.status} for endpoint {endpoint}")
+            return None
         except asyncio.TimeoutError:
             logger.error(f"Timeout while fetching {endpoint}")
         except aiohttp.ClientError as e:
@@ -303,6 +1091,58 @@ class RommBot(discord.Bot):
             logger.error(f"Error fetching {endpoint}: {e}")
         return None
 
+    def _record_transfer(self, response: aiohttp.ClientResponse, decoded_size: int):
+        """Track how many bytes compression saved on the wire."""
+        self.api_metrics['bytes_received'] += decoded_size
+        wire_size = response.content_length
+        if wire_size is not None and response.headers.get('Content-Encoding'):
+            self.api_metrics['bytes_saved_compression'] += max(decoded_size - wire_size, 0)
+
+    def _store_validators(self, endpoint: str, response: aiohttp.ClientResponse, size: int):
+        """Remember ETag/Last-Modified so the next fetch can be a conditional GET answered from the cache."""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            self._validators.pop(endpoint, None)
+            return
+        self._validators[endpoint] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'size': size
+        }
+        self._validators.move_to_end(endpoint)
+        while len(self._validators) > self.MAX_VALIDATORS:
+            self._validators.popitem(last=False)
+
+    def log_metrics(self):
+        """Log API request and cache counters."""
+        requests_made = self.api_metrics['requests']
+        coalesced = self.api_metrics['coalesced']
+        logger.info(
+            f"API metrics: {requests_made} requests, {coalesced} coalesced calls "
+            f"({coalesced / max(requests_made + coalesced, 1):.0%} saved), "
+            f"{self.api_metrics['short_circuited']} short-circuited (breaker {self.circuit_breaker.state}), "
+            f"{self.api_metrics['not_modified']} not modified | "
+            f"Bytes received: {self.api_metrics['bytes_received'] / 1024:.0f} KB, "
+            f"saved by 304s: {self.api_metrics['bytes_saved_not_modified'] / 1024:.0f} KB, "
+            f"saved by compression: {self.api_metrics['bytes_saved_compression'] / 1024:.0f} KB | "
+            f"Cache: {dict(self.cache.stats)}, {len(self.cache.cache)} entries, "
+            f"{self.cache.total_bytes / 1024:.0f} KB | "
+            f"ROM details: {dict(self.rom_cache.stats)}, {len(self.rom_cache)} entries | "
+            f"Search results: {dict(self.search_cache.stats)}, {len(self.search_cache)} pages"
+        )
+        for route, bucket_metrics in self.rate_limiter.metrics().items():
+            logger.info(
+                f"Rate limit bucket {route}: {bucket_metrics['queued']} queued, "
+                f"{bucket_metrics['acquired']} acquired, avg wait {bucket_metrics['avg_wait']:.2f}s, "
+                f"max wait {bucket_metrics['max_wait']:.2f}s"
+            )
+        self.http_pool.log_metrics()
+        # Set up by the Search cog
+        qr_codes = getattr(self, 'qr_codes', None)
+        if qr_codes:
+            logger.info(f"QR codes: {qr_codes.summary()}")
+
     @staticmethod
     def bytes_to_tb(bytes_value: int) -> float:
         """Convert bytes to terabytes with 2 decimal places."""
@@ -349,60 +1189,352 @@ class RommBot(discord.Bot):
 
     async def close(self):
         """Cleanup resources on shutdown."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        for task in list(self._inflight.values()) + list(self._background_tasks):
+            task.cancel()
+        await self.http_pool.close()
+        if self.catalog:
+            await self.catalog.close()
         await super().close()
 
-    async def update_api_data(self):
-        """Periodic API data update task with error handling."""
-        try:
-            # Stats Update
-            raw_stats = await self.fetch_api_endpoint('stats', bypass_cache=True)
-            stats_success = False
-        
-            if raw_stats is not None:
-                sanitized_stats = self.sanitize_data(raw_stats, 'stats')
-                if sanitized_stats:
-                    self.cache.set('stats', sanitized_stats)
-                    stats_success = True
-                    logger.info("Successfully updated stats data")
-                else:
-                    logger.warning("Failed to sanitize stats data")
-            else:
-                logger.warning("Failed to fetch stats data")
+    async def _update_stats(self) -> bool:
+        """Fetch, sanitize and cache stats."""
+        raw_stats = await self.fetch_api_endpoint('stats', bypass_cache=True)
+        if raw_stats is None:
+            logger.warning("Failed to fetch stats data")
+            return False
 
-            # Platforms Update
-            raw_platforms = await self.fetch_api_endpoint('platforms', bypass_cache=True)
-            platforms_success = False
-        
-            if raw_platforms is not None:
-                sanitized_platforms = self.sanitize_data(raw_platforms, 'platforms')
-                if sanitized_platforms:
-                    self.cache.set('platforms', sanitized_platforms)
-                    platforms_success = True
-                    logger.info("Successfully updated platforms data")
-                else:
-                    logger.warning("Failed to sanitize platforms data")
-            else:
-                logger.warning("Failed to fetch platforms data")
+        sanitized_stats = self.sanitize_data(raw_stats, 'stats')
+        if not sanitized_stats:
+            logger.warning("Failed to sanitize stats data")
+            return False
+
+        self.cache.set('stats', sanitized_stats)
+        logger.info("Successfully updated stats data")
+        return True
+
+    async def _update_platforms(self) -> bool:
+        """Fetch, sanitize and cache platforms."""
+        raw_platforms = await self.fetch_api_endpoint('platforms', bypass_cache=True)
+        if raw_platforms is None:
+            logger.warning("Failed to fetch platforms data")
+            return False
 
-            # User Count Update
-            user_count_success = False
+        sanitized_platforms = self.sanitize_data(raw_platforms, 'platforms')
+        if not sanitized_platforms:
+            logger.warning("Failed to sanitize platforms data")
+            return False
+
+        self.cache.set('platforms', sanitized_platforms)
+        self.platform_index.rebuild(raw_platforms)
+        logger.info("Successfully updated platforms data")
+        return True
+
+    async def sync_catalog(self):
+        """Bring the local ROM catalog up to date, re-pulling only the platforms that changed."""
+        if not self.catalog or self._catalog_sync_lock.locked():
+            return
+        if self.degraded:
+            logger.info(f"Skipping catalog sync, RomM circuit breaker is {self.circuit_breaker.state}")
+            return
+        async with self._catalog_sync_lock:
             try:
-                users_data = await self.fetch_api_endpoint('users', bypass_cache=True)
-                if users_data is not None:
-                    user_count_data = {"user_count": len(users_data)}
-                    sanitized_user_count = self.sanitize_data(user_count_data, 'user_count')
-                    if sanitized_user_count is not None:
-                        self.cache.set('user_count', sanitized_user_count)
-                        user_count_success = True
-                        logger.info(f"Successfully updated user count data: {sanitized_user_count}")
-                    else:
-                        logger.warning("Failed to sanitize user count data")
-                else:
-                    logger.warning("Failed to fetch users data")
+                platforms = self.platform_index.platforms
+                if not platforms:
+                    return
+                due = await self.catalog.platforms_due(platforms)
+                if due:
+                    started = time.monotonic()
+                    synced = 0
+                    for platform in due:
+                        roms = await self._fetch_catalog_listing(platform)
+                        if roms is None:
+                            logger.warning(f"Failed to fetch ROM list for catalog sync of {platform['name']}")
+                            continue
+                        await self.catalog.replace_platform(platform['id'], platform['rom_count'], roms)
+                        synced += 1
+
+                    await self.catalog.remove_platforms_except(p['id'] for p in platforms)
+                    logger.info(f"Catalog sync refreshed {synced}/{len(due)} platform(s) in {time.monotonic() - started:.2f}s")
+                # Title autocomplete doesn't wait on index builds, so have every index ready before it's asked for
+                await self.catalog.warm_title_indexes()
             except Exception as e:
-                logger.error(f"Error fetching user count data: {e}")
+                logger.error(f"Error syncing ROM catalog: {e}", exc_info=True)
+
+    async def _fetch_catalog_listing(self, platform: Dict) -> Optional[List[Dict]]:
+        """Page through a platform's ROM list for the catalog. Returns None if any page fails.
+
+        Goes straight to the HTTP pool: the pages never enter the API cache or the
+        validator table, and a slow listing doesn't trip the breaker that guards commands.
+        """
+        auth = aiohttp.BasicAuth(self.config.USER, self.config.PASS)
+        page_size = self.config.CATALOG_PAGE_SIZE
+        roms: List[Dict] = []
+        seen = set()
+        offset = 0
+        while True:
+            url = f"{self.config.API_BASE_URL}/api/roms?platform_id={platform['id']}&limit={page_size}&offset={offset}"
+            self.api_metrics['requests'] += 1
+            try:
+                response = await self.http_pool.request('romm', 'GET', url, auth=auth)
+                if response.status != 200:
+                    logger.warning(f"API returned status {response.status} for catalog page at {offset} of {platform['name']}")
+                    return None
+                body = await response.read()
+                page = json.loads(body)
+                self._record_transfer(response, len(body))
+            except (asyncio.TimeoutError, aiohttp.ClientError, ValueError) as e:
+                logger.warning(f"Error fetching catalog page at {offset} of {platform['name']}: {e!r}")
+                return None
+
+            if isinstance(page, dict):
+                page = page.get('items')
+            if not isinstance(page, list):
+                return None
+            new = [rom for rom in page if isinstance(rom, dict) and rom.get('id') not in seen]
+            roms.extend(new)
+            seen.update(rom.get('id') for rom in new)
+            # RomM may cap the limit below page_size, so a short page is not the end: only an
+            # empty page is, or a page of repeats when RomM ignores the offset
+            if not new:
+                if len(roms) != platform['rom_count']:
+                    logger.warning(
+                        f"Catalog listing of {platform['name']} returned {len(roms)} of {platform['rom_count']} ROMs"
+                    )
+                return roms
+            offset += len(page)
+
+    async def on_scan_complete(self, scanned_platforms: List[str]):
+        """Refresh platforms, drop cached ROM details and re-sync the catalog for whatever a RomM scan touched."""
+        await self._update_platforms()
+        platform_ids = [
+            platform['id'] for platform in (self.platform_index.find(slug) for slug in scanned_platforms) if platform
+        ]
+        self.invalidate_platforms(platform_ids or None)
+        if not self.catalog:
+            return
+        await self.catalog.mark_dirty(platform_ids or None)
+        await self.sync_catalog()
+
+    async def on_rom_scanned(self, rom: Dict):
+        """A scan just (re)processed a ROM, so its cached details are out of date."""
+        if isinstance(rom, dict) and rom.get('id') is not None:
+            self.invalidate_rom(rom['id'])
+
+    def invalidate_rom(self, rom_id: int):
+        """Forget a ROM's details in both the detail cache and the API cache."""
+        self.rom_cache.invalidate(rom_id)
+        self.cache.invalidate(f'roms/{rom_id}')
+
+    def invalidate_platforms(self, platform_ids: Optional[List[int]] = None):
+        """Forget cached ROM details and search results for the given platforms, or for every platform."""
+        if platform_ids is None:
+            self.rom_cache.clear()
+            self.search_cache.clear()
+            stale = [
+                endpoint for endpoint in self.cache.cache
+                if self.cache.endpoint_class(endpoint) in ('rom', 'search')
+            ]
+        else:
+            for platform_id in platform_ids:
+                self.rom_cache.invalidate_platform(platform_id)
+                self.search_cache.invalidate_platform(platform_id)
+            wanted = set(platform_ids)
+            search_prefixes = tuple(f'roms?platform_id={platform_id}&' for platform_id in wanted)
+            # API cache entries may predate the detail cache, e.g. loaded from disk
+            stale = [
+                endpoint for endpoint, data in self.cache.cache.items()
+                if (self.cache.endpoint_class(endpoint) == 'rom'
+                    and isinstance(data, dict) and data.get('platform_id') in wanted)
+                or (self.cache.endpoint_class(endpoint) == 'search' and endpoint.startswith(search_prefixes))
+            ]
+        for endpoint in stale:
+            self.cache.invalidate(endpoint)
+        logger.info(f"Dropped cached ROM details and search results for {'all platforms' if platform_ids is None else f'{len(platform_ids)} platform(s)'}")
+
+    async def fetch_rom_details(self, rom_id: int) -> Optional[Dict]:
+        """Full details for one ROM, from memory when it was viewed recently."""
+        rom = self.rom_cache.get(rom_id)
+        if rom is not None:
+            # ROM details that keep getting opened are worth keeping across restarts
+            if self.persistent_cache and self.rom_cache.hit_counts[rom_id] == self.HOT_ROM_HITS:
+                self._track_task(self.persist_cache_entries([f'roms/{rom_id}']))
+            return rom
+
+        endpoint = f'roms/{rom_id}'
+        rom = await self.fetch_api_endpoint(endpoint)
+        # A stale-while-revalidate or degraded answer is served once but not kept as fresh
+        if isinstance(rom, dict) and rom.get('id') is not None and self.cache.is_fresh(endpoint):
+            self.rom_cache.set(rom)
+        return rom
+
+    def forget_endpoint(self, endpoint: str):
+        """Drop a one-off response from the API cache and the validator table."""
+        self.cache.invalidate(self.raw_key(endpoint))
+        self._validators.pop(endpoint, None)
+
+    async def search_roms(self, platform_id: int, search_term: str, limit: int = 25, offset: int = 0) -> List[Dict]:
+        """One page of RomM search results for a platform, shared by every spelling of the same term."""
+        # The lowercased form is only the cache key; RomM gets the term as typed ('Straße' must not become 'strasse')
+        term = ' '.join(search_term.split())
+        results = self.search_cache.get(platform_id, term, offset, limit)
+        if results is not None:
+            return results
+
+        endpoint = f'roms?platform_id={platform_id}&search_term={quote(term)}&limit={limit}&offset={offset}'
+        results = await self.fetch_api_endpoint(endpoint, bypass_cache=True)
+        # This cache is the only copy: an API cache entry would outlive SEARCH_CACHE_TTL
+        self.forget_endpoint(endpoint)
+        if not isinstance(results, list):
+            if self.degraded:
+                return self.search_cache.peek(platform_id, term, offset, limit) or []
+            return []
+        self.search_cache.set(platform_id, term, offset, limit, results)
+        return results
+
+    async def ensure_platform_index(self) -> PlatformIndex:
+        """Return the platform index, building it from cached or fetched platforms if still empty."""
+        if not self.platform_index.platforms:
+            platforms = await self.fetch_api_endpoint('platforms')
+            if platforms:
+                self.platform_index.rebuild(platforms)
+        return self.platform_index
+
+    async def _probe_user_count(self) -> Optional[int]:
+        """Ask RomM for a single user and read the total from pagination metadata."""
+        self.api_metrics['requests'] += 1
+        try:
+            url = f"{self.config.API_BASE_URL}/api/users"
+            auth = aiohttp.BasicAuth(self.config.USER, self.config.PASS)
+
+            response = await self._romm_get(url, auth=auth, params={'limit': 1})
+            if response is None:
+                return None
+            if response.status != 200:
+                logger.warning(f"API returned status {response.status} for user count probe")
+                return None
+
+            body = await response.read()
+            self._record_transfer(response, len(body))
+            total = response.headers.get('X-Total-Count')
+            data = json.loads(body)
+
+            if total is None and isinstance(data, dict):
+                total = data.get('total')
+            if total is not None:
+                self._user_count_probe = True
+                return int(total)
+
+            # No pagination support; remember that so later syncs go straight to the index
+            self._user_count_probe = False
+            logger.info("RomM does not report a user total, falling back to the local user index")
+            if isinstance(data, list) and len(data) > 1:
+                # The limit was ignored and we already hold the full listing
+                self.user_index.rebuild(data)
+                return len(self.user_index)
+            return None
+        except asyncio.TimeoutError:
+            logger.error("Timeout while probing user count")
+        except aiohttp.ClientError as e:
+            logger.error(f"Network error probing user count: {e}")
+        except Exception as e:
+            logger.error(f"Error probing user count: {e}")
+        return None
+
+    async def ensure_user_index(self) -> Optional[UserIndex]:
+        """Return the local user index, refreshing it from the full users list when it is due."""
+        if self.user_index.needs_refresh():
+            users_data = await self.fetch_api_endpoint('users', bypass_cache=True)
+            if users_data is not None:
+                self.user_index.rebuild(users_data)
+                # The raw list is only needed to build the index
+                self.cache.invalidate('users')
+        return self.user_index if self.user_index.loaded else None
+
+    async def fetch_user_count(self) -> Optional[int]:
+        """Get the user count without downloading every user when RomM allows it."""
+        if self._user_count_probe is not False:
+            count = await self._probe_user_count()
+            if count is not None:
+                return count
+            if self._user_count_probe is None:
+                return None
+
+        user_index = await self.ensure_user_index()
+        return len(user_index) if user_index is not None else None
+
+    async def _update_user_count(self) -> bool:
+        """Fetch and cache the sanitized user count."""
+        try:
+            user_count = await self.fetch_user_count()
+            if user_count is None:
+                logger.warning("Failed to fetch users data")
+                return False
+
+            user_count_data = {"user_count": user_count}
+            sanitized_user_count = self.sanitize_data(user_count_data, 'user_count')
+            if sanitized_user_count is None:
+                logger.warning("Failed to sanitize user count data")
+                return False
+
+            self.cache.set('user_count', sanitized_user_count)
+            logger.info(f"Successfully updated user count data: {sanitized_user_count}")
+            return True
+        except Exception as e:
+            logger.error(f"Error fetching user count data: {e}")
+            return False
+
+    async def _run_update_stages(self, stages: Dict[str, Any], deadline: float) -> Dict[str, bool]:
+        """Run update stages concurrently under one shared deadline and log how long each took."""
+        started = time.monotonic()
+        timings: Dict[str, float] = {}
+
+        async def timed(name: str, coro) -> bool:
+            try:
+                return await coro
+            finally:
+                timings[name] = time.monotonic() - started
+
+        tasks = {name: asyncio.ensure_future(timed(name, coro)) for name, coro in stages.items()}
+        await asyncio.wait(tasks.values(), timeout=deadline)
+
+        results: Dict[str, bool] = {}
+        for name, task in tasks.items():
+            if not task.done():
+                # A slow endpoint only fails its own stage. Its request keeps running either way,
+                # so let the stage finish in the background and sanitize what arrives late.
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+                results[name] = False
+                logger.warning(f"Update stage '{name}' missed the {deadline:.0f}s deadline")
+            elif task.cancelled() or task.exception():
+                results[name] = False
+                logger.error(f"Update stage '{name}' failed: {task.exception() if not task.cancelled() else 'cancelled'}")
+            else:
+                results[name] = bool(task.result())
+
+        logger.info(
+            "Update stage timings: " + ", ".join(
+                f"{name}={timings.get(name, deadline):.2f}s ({'ok' if results[name] else 'failed'})"
+                for name in tasks
+            )
+        )
+        return results
+
+    async def update_api_data(self):
+        """Periodic API data update task with error handling."""
+        try:
+            # Stats, platforms and user count are independent, fetch them concurrently
+            results = await self._run_update_stages(
+                {
+                    'stats': self._update_stats(),
+                    'platforms': self._update_platforms(),
+                    'user_count': self._update_user_count()
+                },
+                deadline=self.config.SYNC_DEADLINE
+            )
+            stats_success = results['stats']
+            platforms_success = results['platforms']
+            user_count_success = results['user_count']
 
             # Update presence based on overall success
             success = stats_success and platforms_success and user_count_success
@@ -429,6 +1561,15 @@ class RommBot(discord.Bot):
                     )
                     await channel.send(status_message)
 
+            # Persist whatever was refreshed so a restart starts warm
+            await self.persist_cache_entries([endpoint for endpoint, updated in results.items() if updated])
+
+            # Catch the local catalog up with any platforms whose ROM counts moved
+            if platforms_success:
+                self._track_task(self.sync_catalog())
+
+            self.log_metrics()
+
         except Exception as e:
             logger.error(f"Error in update task: {e}", exc_info=True)
 
@@ -439,8 +1580,7 @@ async def main():
     except Exception as e:
         logger.error("Error starting bot:", exc_info=True)
     finally:
-        if bot.session and not bot.session.closed:
-            await bot.session.close()
+        await bot.http_pool.close()
 
 if __name__ == "__main__":
     try:
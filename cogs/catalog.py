@@ -0,0 +1,496 @@
+from typing import List, Dict, Optional, Any, Iterable
+from array import array
+import aiosqlite
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+
+from cogs.ranker import FileTags, parse_tags
+
+logger = logging.getLogger('romm_bot.catalog')
+
+def normalize_title(text: str) -> str:
+    """Fold case and accents and turn punctuation into spaces: 'Pokémon - Sapphire' -> 'pokemon sapphire'."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).casefold()
+    return ' '.join(re.sub(r"[^\w]+|_", ' ', text).split())
+
+def trigrams(text: str) -> set:
+    """Character trigrams of a normalized title, padded so short words still count."""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TitleIndex:
+    """Sorted-array prefix index over the distinct ROM titles of one platform.
+
+    Every word of a normalized title starts a key, so 'zel' finds 'The Legend of Zelda'.
+    A key is never stored as a string: it is a (title number, character offset) pair in two
+    parallel arrays, sorted by the title suffix it points at, and a prefix lookup bisects
+    over suffixes sliced on demand before a short scan.
+    """
+    # Most keys looked at per lookup, so a one-letter prefix stays cheap on huge platforms
+    MAX_SCAN = 500
+
+    def __init__(self, names: Iterable[str]):
+        self.titles: List[str] = sorted(set(name for name in names if name))
+        self.normalized: List[str] = [normalize_title(title) for title in self.titles]
+        entries = []
+        for number, text in enumerate(self.normalized):
+            offset = 0
+            for word in text.split(' '):
+                if word:
+                    entries.append((number, offset))
+                offset += len(word) + 1
+        normalized = self.normalized
+        # Stable sort, so equal suffixes stay in title order
+        entries.sort(key=lambda entry: normalized[entry[0]][entry[1]:])
+        self.numbers = array('I', (entry[0] for entry in entries))
+        self.offsets = array('I', (entry[1] for entry in entries))
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def _suffix(self, i: int) -> str:
+        return self.normalized[self.numbers[i]][self.offsets[i]:]
+
+    def complete(self, prefix: str, limit: int = 25) -> List[str]:
+        """Titles with a word starting with the prefix, titles that start with it first."""
+        query = normalize_title(prefix)
+        if not query:
+            return self.titles[:limit]
+        low, high = 0, len(self.numbers)
+        while low < high:
+            mid = (low + high) // 2
+            if self._suffix(mid) < query:
+                low = mid + 1
+            else:
+                high = mid
+        leading, inner = [], []
+        seen = set()
+        for i in range(low, min(low + self.MAX_SCAN, len(self.numbers))):
+            number = self.numbers[i]
+            if not self.normalized[number].startswith(query, self.offsets[i]):
+                break
+            if number in seen:
+                continue
+            seen.add(number)
+            (inner if self.offsets[i] else leading).append(self.titles[number])
+        return (sorted(leading) + sorted(inner))[:limit]
+
+class CatalogIndex:
+    """Local mirror of the RomM ROM catalog with an FTS5 index over names and file names.
+
+    Platforms are synced one at a time: a platform is re-pulled when its ROM count
+    changes, when a scan touched it, or when its copy is older than max_age.
+    Searches are answered from disk and only fall back to the API while a platform is stale.
+    """
+    # Candidates pulled from the trigram index before re-ranking, and the lowest similarity suggested
+    FUZZY_CANDIDATES = 200
+    FUZZY_MIN_SCORE = 0.45
+
+    def __init__(self, db_path: str = "data/catalog.db", max_age: int = 86400):
+        self.db_path = db_path
+        self.max_age = max_age
+        self._db: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+        self.available = True
+        self.fuzzy_available = True
+        # platform id -> title prefix index, built in the background after each sync
+        self.title_indexes: Dict[int, TitleIndex] = {}
+        self._title_builds: Dict[int, asyncio.Future] = {}
+        # Bumped by every sync of a platform so a build that read older rows doesn't replace a newer index
+        self._title_versions: Dict[int, int] = {}
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+    async def initialize(self) -> bool:
+        """Open the database and create the catalog tables. Returns False if FTS5 is unavailable."""
+        if self._db is not None or not self.available:
+            return self.available
+        # Sync, search and autocomplete all arrive here at startup; only the first one opens the database
+        async with self._lock:
+            if self._db is not None or not self.available:
+                return self.available
+            return await self._open()
+
+    async def _open(self) -> bool:
+        db = None
+        try:
+            db = await aiosqlite.connect(self.db_path)
+            await db.executescript("""
+                CREATE TABLE IF NOT EXISTS roms (
+                    id INTEGER PRIMARY KEY,
+                    platform_id INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    file_name TEXT NOT NULL,
+                    regions TEXT NOT NULL DEFAULT '[]',
+                    size_bytes INTEGER NOT NULL DEFAULT 0,
+                    rank_tags TEXT NOT NULL DEFAULT ''
+                );
+                CREATE INDEX IF NOT EXISTS idx_roms_platform ON roms(platform_id);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS roms_fts USING fts5(
+                    name, file_name,
+                    content='roms', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                );
+                CREATE TRIGGER IF NOT EXISTS roms_ai AFTER INSERT ON roms BEGIN
+                    INSERT INTO roms_fts(rowid, name, file_name) VALUES (new.id, new.name, new.file_name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS roms_ad AFTER DELETE ON roms BEGIN
+                    INSERT INTO roms_fts(roms_fts, rowid, name, file_name) VALUES ('delete', old.id, old.name, old.file_name);
+                END;
+                CREATE TRIGGER IF NOT EXISTS roms_au AFTER UPDATE ON roms BEGIN
+                    INSERT INTO roms_fts(roms_fts, rowid, name, file_name) VALUES ('delete', old.id, old.name, old.file_name);
+                    INSERT INTO roms_fts(rowid, name, file_name) VALUES (new.id, new.name, new.file_name);
+                END;
+
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    platform_id INTEGER PRIMARY KEY,
+                    rom_count INTEGER NOT NULL,
+                    synced_at REAL NOT NULL,
+                    dirty INTEGER NOT NULL DEFAULT 0
+                );
+            """)
+            async with db.execute("PRAGMA table_info(roms)") as cursor:
+                columns = {row[1] for row in await cursor.fetchall()}
+            if 'rank_tags' not in columns:
+                # Catalogs created before sort keys were cached; rows are re-tagged on their next sync
+                await db.execute("ALTER TABLE roms ADD COLUMN rank_tags TEXT NOT NULL DEFAULT ''")
+            await db.commit()
+            self._db = db
+        except Exception as e:
+            logger.warning(f"Local catalog disabled, SQLite FTS5 unavailable: {e}")
+            if db is not None:
+                await db.close()
+            self.available = False
+            return False
+
+        try:
+            # Trigram index over normalized titles for typo-tolerant lookups (SQLite 3.34+)
+            await self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS roms_trigram USING fts5(title, tokenize='trigram')"
+            )
+            async with self._db.execute("SELECT EXISTS(SELECT 1 FROM roms_trigram)") as cursor:
+                populated = (await cursor.fetchone())[0]
+            if not populated:
+                async with self._db.execute("SELECT id, name FROM roms") as cursor:
+                    rows = await cursor.fetchall()
+                await self._db.executemany(
+                    "INSERT INTO roms_trigram (rowid, title) VALUES (?, ?)",
+                    [(rom_id, normalize_title(name)) for rom_id, name in rows]
+                )
+            await self._db.commit()
+        except Exception as e:
+            logger.warning(f"Fuzzy catalog search disabled, trigram tokenizer unavailable: {e}")
+            self.fuzzy_available = False
+        return True
+
+    @staticmethod
+    def _row_from_rom(rom: Dict) -> Optional[tuple]:
+        """Flatten a RomM ROM into a catalog row."""
+        if not isinstance(rom, dict) or rom.get('id') is None:
+            return None
+        size_bytes = rom.get('file_size_bytes') or 0
+        if not size_bytes and rom.get('files'):
+            # For multi-file ROMs, sum the sizes
+            size_bytes = sum(f.get('size_bytes', 0) for f in rom['files'])
+        return (
+            rom['id'],
+            rom.get('platform_id', 0),
+            rom.get('name') or rom.get('file_name', ''),
+            rom.get('file_name', ''),
+            json.dumps(rom.get('regions') or []),
+            size_bytes,
+            # Region/revision tags parsed once here so sorting results never re-parses file names
+            parse_tags(rom.get('file_name', '')).to_json()
+        )
+
+    async def platforms_due(self, platforms: Iterable[Dict]) -> List[Dict]:
+        """Platforms whose local copy is missing, dirty, aged out or has a different ROM count."""
+        if not await self.initialize():
+            return []
+        async with self._db.execute("SELECT platform_id, rom_count, synced_at, dirty FROM sync_state") as cursor:
+            state = {row[0]: row[1:] for row in await cursor.fetchall()}
+
+        now = time.time()
+        due = []
+        for platform in platforms:
+            synced = state.get(platform['id'])
+            if (synced is None or synced[2] or synced[0] != platform['rom_count']
+                    or now - synced[1] >= self.max_age):
+                due.append(platform)
+        return due
+
+    async def replace_platform(self, platform_id: int, rom_count: int, roms: List[Dict]):
+        """Swap in a fresh ROM listing for one platform."""
+        if not await self.initialize():
+            return
+        rows = [row for row in (self._row_from_rom(rom) for rom in roms) if row]
+        async with self._lock:
+            if self.fuzzy_available:
+                await self._db.execute(
+                    "DELETE FROM roms_trigram WHERE rowid IN (SELECT id FROM roms WHERE platform_id = ?)",
+                    (platform_id,)
+                )
+                await self._db.executemany(
+                    "DELETE FROM roms_trigram WHERE rowid = ?", [(row[0],) for row in rows]
+                )
+            await self._db.execute("DELETE FROM roms WHERE platform_id = ?", (platform_id,))
+            # ROMs that moved from another platform; deleting keeps the FTS triggers in step
+            await self._db.executemany("DELETE FROM roms WHERE id = ?", [(row[0],) for row in rows])
+            await self._db.executemany(
+                "INSERT INTO roms (id, platform_id, name, file_name, regions, size_bytes, rank_tags) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            if self.fuzzy_available:
+                await self._db.executemany(
+                    "INSERT INTO roms_trigram (rowid, title) VALUES (?, ?)",
+                    [(row[0], normalize_title(row[2])) for row in rows]
+                )
+            await self._db.execute(
+                "INSERT OR REPLACE INTO sync_state (platform_id, rom_count, synced_at, dirty) VALUES (?, ?, ?, 0)",
+                (platform_id, rom_count, time.time())
+            )
+            await self._db.commit()
+        # Only the synced platform's titles are re-indexed, off the event loop
+        version = self._title_versions[platform_id] = self._title_versions.get(platform_id, 0) + 1
+        index = await asyncio.to_thread(TitleIndex, [row[2] for row in rows])
+        if self._title_versions[platform_id] == version:
+            self.title_indexes[platform_id] = index
+
+    async def remove_platforms_except(self, platform_ids: Iterable[int]):
+        """Drop platforms that no longer exist in RomM."""
+        if not await self.initialize():
+            return
+        keep = list(platform_ids)
+        placeholders = ','.join('?' * len(keep)) or 'NULL'
+        async with self._lock:
+            if self.fuzzy_available:
+                await self._db.execute(
+                    f"DELETE FROM roms_trigram WHERE rowid IN "
+                    f"(SELECT id FROM roms WHERE platform_id NOT IN ({placeholders}))",
+                    keep
+                )
+            await self._db.execute(f"DELETE FROM roms WHERE platform_id NOT IN ({placeholders})", keep)
+            await self._db.execute(f"DELETE FROM sync_state WHERE platform_id NOT IN ({placeholders})", keep)
+            await self._db.commit()
+        for platform_id in set(self.title_indexes) - set(keep):
+            del self.title_indexes[platform_id]
+            self._title_versions.pop(platform_id, None)
+
+    async def mark_dirty(self, platform_ids: Optional[Iterable[int]] = None):
+        """Flag platforms (all of them by default) for re-sync, e.g. after a scan."""
+        if not await self.initialize():
+            return
+        async with self._lock:
+            if platform_ids is None:
+                await self._db.execute("UPDATE sync_state SET dirty = 1")
+            else:
+                await self._db.executemany(
+                    "UPDATE sync_state SET dirty = 1 WHERE platform_id = ?",
+                    [(platform_id,) for platform_id in platform_ids]
+                )
+            await self._db.commit()
+
+    async def is_fresh(self, platform_id: int) -> bool:
+        """Whether searches for a platform can be answered locally."""
+        if not await self.initialize():
+            return False
+        async with self._db.execute(
+            "SELECT synced_at, dirty FROM sync_state WHERE platform_id = ?", (platform_id,)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return bool(row) and not row[1] and time.time() - row[0] < self.max_age
+
+    async def fresh_platforms(self) -> set:
+        """Ids of every platform whose searches can be answered locally."""
+        if not await self.initialize():
+            return set()
+        async with self._db.execute(
+            "SELECT platform_id FROM sync_state WHERE dirty = 0 AND synced_at > ?", (time.time() - self.max_age,)
+        ) as cursor:
+            return {row[0] for row in await cursor.fetchall()}
+
+    @staticmethod
+    def _match_expression(term: str) -> Optional[str]:
+        """Turn free text into an FTS5 prefix query that matches every word."""
+        words = re.findall(r"\w+", term.lower())
+        if not words:
+            return None
+        return ' '.join(f'"{word}"*' for word in words)
+
+    @staticmethod
+    def _rom_from_row(row: tuple) -> Dict[str, Any]:
+        rom_id, platform_id, name, file_name, regions, size_bytes, rank_tags = row
+        return {
+            'id': rom_id,
+            'platform_id': platform_id,
+            'name': name,
+            'file_name': file_name,
+            'regions': json.loads(regions),
+            'file_size_bytes': size_bytes,
+            '_rank_tags': FileTags.from_json(rank_tags) if rank_tags else None
+        }
+
+    async def search(self, term: str, platform_id: Optional[int] = None, limit: int = 25,
+                     offset: int = 0) -> List[Dict[str, Any]]:
+        """Full-text search over ROM names and file names, best matches first."""
+        expression = self._match_expression(term)
+        if not expression or not await self.initialize():
+            return []
+
+        query = (
+            "SELECT r.id, r.platform_id, r.name, r.file_name, r.regions, r.size_bytes, r.rank_tags "
+            "FROM roms_fts JOIN roms r ON r.id = roms_fts.rowid "
+            "WHERE roms_fts MATCH ?"
+        )
+        params: List[Any] = [expression]
+        if platform_id is not None:
+            query += " AND r.platform_id = ?"
+            params.append(platform_id)
+        query += " ORDER BY bm25(roms_fts) LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        started = time.perf_counter()
+        async with self._db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        logger.info(f"Catalog search '{term}' returned {len(rows)} result(s) in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return [self._rom_from_row(row) for row in rows]
+
+    async def rom_at(self, platform_id: int, index: int) -> Optional[Dict[str, Any]]:
+        """The ROM at a position in a platform's id order, for sampling without loading the platform."""
+        if not await self.initialize():
+            return None
+        async with self._db.execute(
+            "SELECT id, platform_id, name, file_name, regions, size_bytes, rank_tags FROM roms "
+            "WHERE platform_id = ? ORDER BY id LIMIT 1 OFFSET ?",
+            (platform_id, index)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return self._rom_from_row(row) if row else None
+
+    def _start_title_build(self, platform_id: int) -> asyncio.Future:
+        """Build a platform's title index, sharing a build that is already running."""
+        build = self._title_builds.get(platform_id)
+        if build is None:
+            build = asyncio.ensure_future(self._build_title_index(platform_id))
+            self._title_builds[platform_id] = build
+            build.add_done_callback(lambda _: self._title_builds.pop(platform_id, None))
+        return build
+
+    async def warm_title_indexes(self):
+        """Build the title index of every current platform that lacks one, one platform at a time."""
+        for platform_id in sorted(await self.fresh_platforms()):
+            if platform_id not in self.title_indexes:
+                await asyncio.shield(self._start_title_build(platform_id))
+
+    async def _build_title_index(self, platform_id: int) -> TitleIndex:
+        started = time.perf_counter()
+        version = self._title_versions.get(platform_id, 0)
+        async with self._db.execute("SELECT name FROM roms WHERE platform_id = ?", (platform_id,)) as cursor:
+            names = [row[0] for row in await cursor.fetchall()]
+        index = await asyncio.to_thread(TitleIndex, names)
+        if self._title_versions.get(platform_id, 0) != version:
+            # A sync finished meanwhile and already installed a newer index
+            return self.title_indexes.get(platform_id, index)
+        self.title_indexes[platform_id] = index
+        logger.info(
+            f"Built title index for platform {platform_id}: {len(index)} titles "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return index
+
+    async def complete_title(self, prefix: str, platform_id: Optional[int] = None, limit: int = 25) -> List[str]:
+        """Game titles for autocomplete, from one platform or from every current platform.
+
+        This never waits for an index build: platforms still being indexed are skipped and
+        their builds are started for the next keystroke.
+        """
+        if platform_id is not None:
+            known = platform_id in self.title_indexes or await self.is_fresh(platform_id)
+            platform_ids = [platform_id] if known else []
+        else:
+            platform_ids = sorted(await self.fresh_platforms())
+        indexes = []
+        for pid in platform_ids:
+            index = self.title_indexes.get(pid)
+            if index is None:
+                self._start_title_build(pid)
+            else:
+                indexes.append(index)
+        titles: List[str] = []
+        for index in indexes:
+            titles.extend(index.complete(prefix, limit))
+        if platform_id is None:
+            query = normalize_title(prefix)
+            titles = sorted(set(titles), key=lambda title: (not normalize_title(title).startswith(query), title))
+        return titles[:limit]
+
+    @staticmethod
+    def similarity(query: str, title: str) -> float:
+        """Trigram similarity weighted towards how much of the query the title covers."""
+        query_grams, title_grams = trigrams(query), trigrams(title)
+        if not query_grams or not title_grams:
+            return 0.0
+        shared = len(query_grams & title_grams)
+        coverage = shared / len(query_grams)
+        dice = 2 * shared / (len(query_grams) + len(title_grams))
+        return 0.7 * coverage + 0.3 * dice
+
+    async def fuzzy_search(self, term: str, platform_id: Optional[int] = None,
+                           limit: int = 10) -> List[Dict[str, Any]]:
+        """Typo-tolerant search: gather candidates sharing trigrams with the term, then rank by similarity.
+
+        Each result carries a 'similarity' score between 0 and 1.
+        """
+        query = normalize_title(term)
+        if len(query) < 3 or not await self.initialize() or not self.fuzzy_available:
+            return []
+
+        grams = [gram for gram in trigrams(query) if gram.strip() and len(gram.strip()) == 3]
+        if not grams:
+            return []
+        expression = ' OR '.join('"' + gram.replace('"', '""') + '"' for gram in grams)
+
+        sql = (
+            "SELECT r.id, r.platform_id, r.name, r.file_name, r.regions, r.size_bytes, r.rank_tags "
+            "FROM roms_trigram JOIN roms r ON r.id = roms_trigram.rowid "
+            "WHERE roms_trigram MATCH ?"
+        )
+        params: List[Any] = [expression]
+        if platform_id is not None:
+            sql += " AND r.platform_id = ?"
+            params.append(platform_id)
+        sql += " ORDER BY bm25(roms_trigram) LIMIT ?"
+        params.append(self.FUZZY_CANDIDATES)
+
+        started = time.perf_counter()
+        async with self._db.execute(sql, params) as cursor:
+            rows = await cursor.fetchall()
+
+        ranked = []
+        for row in rows:
+            score = self.similarity(query, normalize_title(row[2]))
+            if score >= self.FUZZY_MIN_SCORE:
+                rom = self._rom_from_row(row)
+                rom['similarity'] = score
+                ranked.append(rom)
+        ranked.sort(key=lambda rom: rom['similarity'], reverse=True)
+        logger.info(
+            f"Catalog fuzzy search '{term}' ranked {len(rows)} candidate(s) "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return ranked[:limit]
+
+    async def close(self):
+        """Close the database connection."""
+        for build in list(self._title_builds.values()):
+            build.cancel()
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
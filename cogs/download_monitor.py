@@ -138,57 +138,56 @@ class DownloadMonitor(commands.Cog):
             
         while True:
             try:
-                # Connect to Docker socket directly
-                async with aiohttp.UnixConnector(path="/var/run/docker.sock") as connector:
-                    async with aiohttp.ClientSession(connector=connector) as session:
-                        romm_container = self.docker_client.containers.get('romm')
-                        container_id = romm_container.id
-                        
-                        print(f"Connected to container {romm_container.name} ({container_id})")
-                        
-                        # Docker API endpoint for logs
-                        url = f"http://unix/containers/{container_id}/logs"
-                        params = {
-                            "follow": "true",
-                            "stdout": "true",
-                            "stderr": "true",
-                            "timestamps": "true"
-                        }
-                        
-                        async with session.get(url, params=params) as response:
-                            print("Log stream started...")
-                            async for line in response.content:
-                                # Docker multiplexes streams, so we need to strip the header
-                                if len(line) > 8:  # Docker log header is 8 bytes
-                                    line = line[8:].decode('utf-8').strip()
-                                    print(f"Log received: {line}")
-                                    
-                                    if "INFO:    [RomM][rom]" in line and "is downloading" in line:
-                                        print(f"Found download: {line}")
-                                        match = self.download_pattern.search(line)
-                                        if match:
-                                            timestamp, username, rom_name = match.groups()
-                                            print(f"Matched download - User: {username}, ROM: {rom_name}")
+                # Connect to Docker socket through the shared HTTP pool
+                session = await self.bot.http_pool.session('docker')
+                romm_container = self.docker_client.containers.get('romm')
+                container_id = romm_container.id
+                
+                print(f"Connected to container {romm_container.name} ({container_id})")
+                
+                # Docker API endpoint for logs
+                url = f"http://unix/containers/{container_id}/logs"
+                params = {
+                    "follow": "true",
+                    "stdout": "true",
+                    "stderr": "true",
+                    "timestamps": "true"
+                }
+                
+                async with session.get(url, params=params) as response:
+                    print("Log stream started...")
+                    async for line in response.content:
+                        # Docker multiplexes streams, so we need to strip the header
+                        if len(line) > 8:  # Docker log header is 8 bytes
+                            line = line[8:].decode('utf-8').strip()
+                            print(f"Log received: {line}")
+                            
+                            if "INFO:    [RomM][rom]" in line and "is downloading" in line:
+                                print(f"Found download: {line}")
+                                match = self.download_pattern.search(line)
+                                if match:
+                                    timestamp, username, rom_name = match.groups()
+                                    print(f"Matched download - User: {username}, ROM: {rom_name}")
     
-                                            # Log to database
-                                            await self.log_download(username, rom_name)
+                                    # Log to database
+                                    await self.log_download(username, rom_name)
     
-                                            embed = discord.Embed(
-                                                title="🎮 New Download",
-                                                description=f"**{rom_name}**",
-                                                color=discord.Color.blue(),
-                                                timestamp=datetime.now()
-                                            )
-                                            embed.add_field(
-                                                name="User",
-                                                value=username,
-                                                inline=True
-                                            )
-                                            
-                                            channel = self.bot.get_channel(self.bot.config.CHANNEL_ID)
-                                            if channel:
-                                                await channel.send(embed=embed)
-                                                print(f"Notification sent for {rom_name}")
+                                    embed = discord.Embed(
+                                        title="🎮 New Download",
+                                        description=f"**{rom_name}**",
+                                        color=discord.Color.blue(),
+                                        timestamp=datetime.now()
+                                    )
+                                    embed.add_field(
+                                        name="User",
+                                        value=username,
+                                        inline=True
+                                    )
+                                    
+                                    channel = self.bot.get_channel(self.bot.config.CHANNEL_ID)
+                                    if channel:
+                                        await channel.send(embed=embed)
+                                        print(f"Notification sent for {rom_name}")
     
             except Exception as e:
                 print(f"Monitor error: {e}")
@@ -35,6 +35,7 @@ class EmojiManager(commands.Cog):
             if self.bot.guilds:
                 guild = self.bot.guilds[0]
                 self.bot.emoji_dict = {emoji.name: emoji for emoji in guild.emojis}
+                self.bot.dispatch('emoji_dict_update', None)
                 #print(f"Initialized emoji dictionary with {len(self.bot.emoji_dict)} emojis")
                 #print("\nEmoji Dictionary Contents:")
                 #for name, emoji in self.bot.emoji_dict.items():
@@ -387,12 +388,11 @@ class EmojiManager(commands.Cog):
             print(f"Using {'extended' if self.is_nitro_server(guild) else 'standard'} emoji list for {guild.name}")
             print(f"Selected URL: {emoji_url}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(emoji_url) as response:
-                    if response.status != 200:
-                        print(f"Warning: Failed to fetch emoji list: {response.status}")
-                        return []
-                    content = await response.text()
+            response = await self.bot.http_pool.request('github', 'GET', emoji_url)
+            if response.status != 200:
+                print(f"Warning: Failed to fetch emoji list: {response.status}")
+                return []
+            content = await response.text()
         
             # Parse the content into emoji pairs
             emoji_list = []
@@ -431,13 +431,12 @@ class EmojiManager(commands.Cog):
     async def upload_emoji(self, guild: discord.Guild, name: str, url: str) -> bool:
         """Upload a single emoji to the server."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        print(f"Failed to download emoji {name}: {response.status}")
-                        return False
-                    
-                    image_data = await response.read()
+            response = await self.bot.http_pool.request('github', 'GET', url)
+            if response.status != 200:
+                print(f"Failed to download emoji {name}: {response.status}")
+                return False
+            
+            image_data = await response.read()
 
             # Clean the emoji name by replacing hyphens with underscores for Discord compatibility
             clean_name = name.strip().replace('-', '_').lower()
@@ -463,6 +462,30 @@ class EmojiManager(commands.Cog):
         
         await self.process_guild_emojis(guild)
     
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(self, guild: discord.Guild, before, after):
+        """Keep the emoji dictionary in step with emojis added, renamed or removed later on."""
+        if not self.bot.guilds or guild.id != self.bot.guilds[0].id:
+            return
+        try:
+            before_by_id = {emoji.id: emoji for emoji in before}
+            after_by_id = {emoji.id: emoji for emoji in after}
+            changed = set()
+            for emoji_id, emoji in before_by_id.items():
+                if emoji_id not in after_by_id or after_by_id[emoji_id].name != emoji.name:
+                    changed.add(emoji.name)
+                    if getattr(self.bot.emoji_dict.get(emoji.name), 'id', None) == emoji_id:
+                        del self.bot.emoji_dict[emoji.name]
+            for emoji_id, emoji in after_by_id.items():
+                if emoji_id not in before_by_id or before_by_id[emoji_id].name != emoji.name:
+                    changed.add(emoji.name)
+                self.bot.emoji_dict[emoji.name] = emoji
+            if changed:
+                logger.info(f"Emojis changed in {guild.name}: {', '.join(sorted(changed))}")
+                self.bot.dispatch('emoji_dict_update', changed)
+        except Exception as e:
+            logger.error(f"Error handling emoji update for {guild.name}: {e}")
+
     @commands.Cog.listener()
     async def on_ready(self):
         """Initialize emoji dictionary when bot starts"""
@@ -0,0 +1,197 @@
+from typing import Dict, Optional, Any
+import aiohttp
+import asyncio
+import logging
+import random
+import time
+from collections import defaultdict
+
+logger = logging.getLogger('romm_bot.http')
+
+# aiohttp decodes gzip/deflate natively and brotli when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+# Statuses worth retrying for idempotent requests
+RETRY_STATUSES = {429, 502, 503, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+class ServiceMetrics:
+    """Latency and status counters for one upstream service."""
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.statuses: Dict[int, int] = defaultdict(int)
+
+    def record(self, latency: float, status: Optional[int] = None):
+        self.requests += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        if status is None:
+            self.errors += 1
+        else:
+            self.statuses[status] += 1
+
+    def summary(self) -> str:
+        avg = self.total_latency / self.requests * 1000 if self.requests else 0
+        statuses = ' '.join(f"{status}={count}" for status, count in sorted(self.statuses.items()))
+        return (
+            f"{self.requests} requests, avg {avg:.0f}ms, max {self.max_latency * 1000:.0f}ms, "
+            f"{self.retries} retries, {self.errors} errors, statuses: {statuses or 'none'}"
+        )
+
+class HTTPPool:
+    """Shared HTTP layer: one keep-alive connection pool with a DNS cache and a session per service.
+
+    Services are 'romm', 'igdb', 'github' and 'docker'. Each gets its own timeout,
+    default headers and metrics, while the TCP services share a single connector so
+    connections and DNS lookups are reused across cogs.
+    """
+    def __init__(self, timeouts: Optional[Dict[str, Optional[float]]] = None,
+                 headers: Optional[Dict[str, Dict[str, str]]] = None,
+                 retries: int = 2, backoff: float = 0.5, max_backoff: float = 10,
+                 limit_per_host: int = 10, dns_ttl: int = 300,
+                 docker_socket: str = "/var/run/docker.sock"):
+        self.timeouts = {'romm': 10, 'igdb': 15, 'github': 30, 'docker': None}
+        self.timeouts.update(timeouts or {})
+        self.headers = headers or {}
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.docker_socket = docker_socket
+        self.metrics: Dict[str, ServiceMetrics] = defaultdict(ServiceMetrics)
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._lock = asyncio.Lock()
+
+    def _trace_config(self, service: str) -> aiohttp.TraceConfig:
+        """Record latency and status of every request made through a service session."""
+        trace_config = aiohttp.TraceConfig()
+        metrics = self.metrics[service]
+
+        async def on_request_start(session, ctx, params):
+            ctx.started = time.monotonic()
+
+        async def on_request_end(session, ctx, params):
+            metrics.record(time.monotonic() - ctx.started, params.response.status)
+
+        async def on_request_exception(session, ctx, params):
+            metrics.record(time.monotonic() - ctx.started)
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_request_exception.append(on_request_exception)
+        return trace_config
+
+    async def session(self, service: str) -> aiohttp.ClientSession:
+        """Return the pooled session for a service, creating it on first use."""
+        session = self._sessions.get(service)
+        if session is not None and not session.closed:
+            return session
+
+        async with self._lock:
+            session = self._sessions.get(service)
+            if session is not None and not session.closed:
+                return session
+
+            if service == 'docker':
+                connector = aiohttp.UnixConnector(path=self.docker_socket)
+                connector_owner = True
+            else:
+                if self._connector is None or self._connector.closed:
+                    self._connector = aiohttp.TCPConnector(
+                        limit_per_host=self.limit_per_host,
+                        ttl_dns_cache=self.dns_ttl,
+                        keepalive_timeout=60
+                    )
+                connector = self._connector
+                connector_owner = False
+
+            headers = {"Accept-Encoding": ACCEPT_ENCODING}
+            headers.update(self.headers.get(service, {}))
+            timeout = self.timeouts.get(service)
+            session = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=connector_owner,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                headers=headers,
+                trace_configs=[self._trace_config(service)]
+            )
+            self._sessions[service] = session
+            return session
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when the server sends one."""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def request(self, service: str, method: str, url: str, retries: Optional[int] = None,
+                      **kwargs: Any) -> aiohttp.ClientResponse:
+        """Perform a request and return the response with its body already read.
+
+        Idempotent requests are retried with jittered backoff on connection errors,
+        timeouts and 429/5xx responses. The service timeout is one budget shared by
+        every attempt and backoff, so retries never make a caller wait longer than a
+        single request could. The last error is re-raised.
+        """
+        session = await self.session(service)
+        method = method.upper()
+        attempts = (self.retries if retries is None else retries) if method in IDEMPOTENT_METHODS else 0
+        budget = self.timeouts.get(service)
+        deadline = time.monotonic() + budget if budget and 'timeout' not in kwargs else None
+
+        for attempt in range(attempts + 1):
+            remaining = deadline - time.monotonic() if deadline is not None else None
+            if remaining is not None:
+                kwargs['timeout'] = aiohttp.ClientTimeout(total=max(remaining, 0.001))
+            try:
+                response = await session.request(method, url, **kwargs)
+                # Reading to EOF hands the connection back to the pool while keeping the body readable
+                await response.read()
+                if response.status not in RETRY_STATUSES or attempt >= attempts:
+                    return response
+                delay = self._backoff_delay(attempt, response.headers.get('Retry-After'))
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    return response
+                logger.warning(f"{service} returned {response.status} for {url}, retrying in {delay:.1f}s")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= attempts:
+                    raise
+                delay = self._backoff_delay(attempt)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+                logger.warning(f"{service} request to {url} failed ({e!r}), retrying in {delay:.1f}s")
+
+            self.metrics[service].retries += 1
+            await asyncio.sleep(delay)
+
+    def log_metrics(self):
+        """Log per-service latency and status counters."""
+        for service, metrics in self.metrics.items():
+            if metrics.requests:
+                logger.info(f"HTTP {service}: {metrics.summary()}")
+
+    async def close(self):
+        """Close every service session and the shared connector."""
+        for session in self._sessions.values():
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
+        if self._connector is not None and not self._connector.closed:
+            await self._connector.close()
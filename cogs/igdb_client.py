@@ -10,12 +10,14 @@ logger = logging.getLogger(__name__)
 
 class IGDBClient:
     """IGDB API client for game metadata"""
-    def __init__(self):
+    def __init__(self, http_pool=None):
         self.client_id = os.getenv('IGDB_CLIENT_ID')
         self.client_secret = os.getenv('IGDB_CLIENT_SECRET')
         self.access_token = None
         self.token_expires = None
         self._session: Optional[aiohttp.ClientSession] = None
+        # Shared bot HTTP pool; the client only owns a session when none is given
+        self.http_pool = http_pool
         
         if not all([self.client_id, self.client_secret]):
             logger.warning("IGDB credentials not found in environment variables")
@@ -23,6 +25,8 @@ class IGDBClient:
 
     async def ensure_session(self) -> aiohttp.ClientSession:
         """Ensure an active session exists and return it."""
+        if self.http_pool is not None:
+            return await self.http_pool.session('igdb')
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession()
         return self._session
@@ -32,7 +32,7 @@ class Info(commands.Cog):
     async def update_voice_channel(self, channel: discord.VoiceChannel, new_name: str):
         """Update voice channel with rate limiting."""
         if channel.name != new_name:
-            await self.bot.rate_limiter.acquire()
+            await self.bot.rate_limiter.acquire(f"channel_edit:{channel.id}")
             await channel.edit(name=new_name)
 
     def has_stats_changed(self, new_stats: Dict[str, Any]) -> bool:
@@ -93,7 +93,7 @@ class Info(commands.Cog):
                     self.stat_channels[stat] = existing_channel
                     channels_to_keep.add(existing_channel.id)
                 else:
-                    await self.bot.rate_limiter.acquire()
+                    await self.bot.rate_limiter.acquire(f"channel_create:{guild.id}")
                     self.stat_channels[stat] = await category.create_voice_channel(
                         name=new_name,
                         user_limit=0
@@ -103,7 +103,7 @@ class Info(commands.Cog):
             # Clean up old channels
             for channel in category.voice_channels:
                 if channel.id not in channels_to_keep:
-                    await self.bot.rate_limiter.acquire()
+                    await self.bot.rate_limiter.acquire(f"channel_delete:{guild.id}")
                     await channel.delete()
                     
             # Update last known stats
@@ -116,8 +116,21 @@ class Info(commands.Cog):
     async def update_presence(self, status: bool):
         """Update bot's presence with rate limiting."""
         try:
-            await self.bot.rate_limiter.acquire()
-            if status and 'stats' in self.bot.cache.cache:
+            await self.bot.rate_limiter.acquire('presence')
+            if self.bot.degraded:
+                # Show the breaker state, with the last known game count if we still have it
+                breaker = self.bot.circuit_breaker
+                state = "reconnecting" if breaker.state == breaker.HALF_OPEN else "offline"
+                stats_data = self.bot.cache.cache.get('stats')
+                games = f"{stats_data['Roms']:,}" if stats_data else "0"
+                await self.bot.change_presence(
+                    activity=discord.Activity(
+                        type=discord.ActivityType.playing,
+                        name=f"{games} games ⚠️RomM {state}, using cached data⚠️"
+                    ),
+                    status=discord.Status.idle
+                )
+            elif status and 'stats' in self.bot.cache.cache:
                 stats_data = self.bot.cache.cache['stats']
                 await self.bot.change_presence(
                     activity=discord.Activity(
@@ -142,13 +155,11 @@ class Info(commands.Cog):
         await self.bot.wait_until_ready()
         try:
             # Get platforms from API
-            raw_platforms = await self.bot.fetch_api_endpoint('platforms')
-            if raw_platforms:
-                platforms_data = self.bot.sanitize_data(raw_platforms, data_type='platforms')
+            platform_index = await self.bot.ensure_platform_index()
+            if platform_index.platforms:
                 # Check if Switch exists in platforms
                 self.has_switch = any(
-                    platform['name'].lower() in ['nintendo switch', 'switch'] 
-                    for platform in platforms_data
+                    platform_index.find(name) for name in ['nintendo switch', 'switch']
                 )
                 logger.info(f"Switch platform {'found' if self.has_switch else 'not found'} in platform list")
         except Exception as e:
@@ -174,6 +185,11 @@ class Info(commands.Cog):
             except Exception as e:
                 logger.error(f"Error updating stats for guild {guild.id}: {e}", exc_info=True)
 
+    @commands.Cog.listener()
+    async def on_romm_circuit_change(self, state: str):
+        """Reflect RomM circuit breaker changes in the presence right away."""
+        await self.update_presence(state == self.bot.circuit_breaker.CLOSED)
+
     # Add a method to be called when API data updates
     async def on_stats_update(self):
         """Called when new stats are fetched from the API."""
@@ -223,6 +239,9 @@ class Info(commands.Cog):
         try:
             stats_data = self.bot.cache.get('stats')
             user_count_data = self.bot.cache.get('user_count')
+            if self.bot.degraded:
+                stats_data = stats_data or self.bot.cache.peek('stats')
+                user_count_data = user_count_data or self.bot.cache.peek('user_count')
             
             if stats_data:
                 # Merge user count into stats data if available
@@ -235,9 +254,12 @@ class Info(commands.Cog):
                 else:
                     time_str = "Unknown"
                 
+                description = f"Last updated: {time_str}"
+                if self.bot.degraded:
+                    description += "\n⚠️ RomM is unreachable, showing cached data"
                 embed = discord.Embed(
                     title="Server Stats",
-                    description=f"Last updated: {time_str}",
+                    description=description,
                     color=discord.Color.blue()
                 )
             
@@ -297,9 +319,9 @@ class Info(commands.Cog):
             await ctx.defer()
         
             # Fetch platforms data
-            raw_platforms = await self.bot.fetch_api_endpoint('platforms')
-            if raw_platforms:
-                platforms_data = self.bot.sanitize_data(raw_platforms, data_type='platforms')
+            platform_index = await self.bot.ensure_platform_index()
+            if platform_index.platforms:
+                platforms_data = platform_index.platforms
             
                 if platforms_data:
                     # Create embed with platform information
@@ -335,7 +357,10 @@ class Info(commands.Cog):
                 
                     # Add total at the bottom
                     total_roms = sum(platform['rom_count'] for platform in platforms_data)
-                    embed.set_footer(text=f"Total ROMs across all platforms: {total_roms:,}")
+                    footer = f"Total ROMs across all platforms: {total_roms:,}"
+                    if self.bot.degraded:
+                        footer += " | ⚠️ RomM is unreachable, showing cached data"
+                    embed.set_footer(text=footer)
                 
                     await ctx.respond(embed=embed)
                 else:
@@ -0,0 +1,221 @@
+from typing import Dict, List, Optional, Tuple, Any, Callable, NamedTuple, Iterable
+from functools import lru_cache
+import json
+import logging
+import os
+import re
+
+logger = logging.getLogger('romm_bot.ranker')
+
+# Every (...) or [...] group in a No-Intro, Redump, TOSEC or GoodTools file name, matched in one pass
+TAG_PATTERN = re.compile(r"\(([^()]*)\)|\[([^\[\]]*)\]")
+REVISION_PATTERN = re.compile(r"^(?:rev(?:ision)?\s*([0-9a-z.]+)|v\s*([0-9][0-9a-z.]*))$")
+
+# Region names and codes as they appear in file names, mapped to one canonical code.
+# Two-letter codes that double as language tags, e.g. (En,Fr,De), are left out.
+REGION_ALIASES = {
+    'usa': 'USA', 'us': 'USA', 'u': 'USA', 'america': 'USA', 'north america': 'USA',
+    'world': 'WORLD', 'w': 'WORLD',
+    'europe': 'EUR', 'eur': 'EUR', 'eu': 'EUR', 'e': 'EUR', 'pal': 'EUR',
+    'japan': 'JPN', 'jpn': 'JPN', 'jp': 'JPN', 'j': 'JPN',
+    'asia': 'ASIA', 'as': 'ASIA',
+    'australia': 'AUS', 'aus': 'AUS', 'au': 'AUS', 'a': 'AUS',
+    'brazil': 'BRA', 'bra': 'BRA', 'br': 'BRA', 'b': 'BRA',
+    'canada': 'CAN', 'can': 'CAN', 'ca': 'CAN', 'c': 'CAN',
+    'china': 'CHN', 'chn': 'CHN', 'cn': 'CHN', 'ch': 'CHN',
+    'france': 'FRA', 'fra': 'FRA', 'f': 'FRA',
+    'germany': 'GER', 'ger': 'GER', 'g': 'GER',
+    'hong kong': 'HK', 'hk': 'HK',
+    'italy': 'ITA', 'ita': 'ITA', 'i': 'ITA',
+    'korea': 'KOR', 'kor': 'KOR', 'kr': 'KOR', 'k': 'KOR',
+    'netherlands': 'NED', 'ned': 'NED', 'h': 'NED',
+    'russia': 'RUS', 'rus': 'RUS', 'r': 'RUS',
+    'spain': 'SPA', 'spa': 'SPA', 's': 'SPA',
+    'sweden': 'SWE', 'swe': 'SWE',
+    'taiwan': 'TWN', 'twn': 'TWN', 'tw': 'TWN',
+    'united kingdom': 'UK', 'uk': 'UK', 'gb': 'UK',
+}
+# GoodTools one-letter region codes, e.g. (U) or (F)
+GOODTOOLS_CODES = {'U', 'E', 'J', 'W', 'K', 'A', 'B', 'C', 'F', 'G', 'H', 'I', 'R', 'S'}
+# Codes GoodTools packs together into one tag, e.g. (UE) or (JUE); anything else, like (SFC), is not a region
+GOODTOOLS_COMBINED_CODES = {'U', 'E', 'J'}
+
+PRERELEASE_TAGS = ('beta', 'proto', 'prototype', 'alpha', 'pre-release', 'preview')
+DEMO_TAGS = ('demo', 'promo', 'promotional', 'sample', 'sampler', 'kiosk', 'trial')
+# GoodTools dump flags ranked from usable to broken: fixed and trained, hack, then bad dump and overdump.
+# Clean dumps rank 0.
+DUMP_FLAG_RANKS = {'f': 1, 't': 1, 'h': 2, 'b': 3, 'o': 3}
+
+REVISION_CHOICES = ('latest', 'original', 'any')
+
+class FileTags(NamedTuple):
+    """What a file name's tags say about a release, parsed once per file name."""
+    regions: Tuple[str, ...]
+    prerelease: bool
+    demo: bool
+    revision: float
+    dump: int  # Worst GoodTools dump flag, see DUMP_FLAG_RANKS
+
+    def to_json(self) -> str:
+        return json.dumps([list(self.regions), self.prerelease, self.demo, self.revision, self.dump])
+
+    @classmethod
+    def from_json(cls, data: str) -> Optional["FileTags"]:
+        """Load cached tags; older four-field entries return None so the file name is parsed again."""
+        try:
+            regions, prerelease, demo, revision, dump = json.loads(data)
+            return cls(tuple(regions), bool(prerelease), bool(demo), float(revision), int(dump))
+        except (TypeError, ValueError):
+            return None
+
+def normalize_region(name: str) -> Optional[str]:
+    """Canonical region code for a region name or code, e.g. 'Europe' -> 'EUR'."""
+    return REGION_ALIASES.get(' '.join(name.lower().split()))
+
+def _revision_number(token: str) -> Optional[float]:
+    """'Rev 2' -> 2, 'Rev A' -> 1, 'v1.1' -> 1.1."""
+    match = REVISION_PATTERN.match(token)
+    if not match:
+        return None
+    value = match.group(1) or match.group(2)
+    if value.isalpha() and len(value) == 1:
+        return float(ord(value) - ord('a') + 1)
+    try:
+        return float(value.rstrip('.'))
+    except ValueError:
+        parts = re.findall(r"\d+", value)
+        return float(parts[0]) if parts else None
+
+def _is_goodtools_code(token: str) -> bool:
+    """'U', 'F' or 'JUE' are GoodTools regions; 'SFC' or 'NTSC' are not."""
+    if len(token) == 1:
+        return token in GOODTOOLS_CODES
+    return len(token) <= 3 and set(token) <= GOODTOOLS_COMBINED_CODES and len(set(token)) == len(token)
+
+@lru_cache(maxsize=16384)
+def parse_tags(file_name: str) -> FileTags:
+    """Tokenize the tags of a ROM file name, e.g. 'Game (USA, Europe) (Rev 1) (Beta).zip'."""
+    regions: List[str] = []
+    prerelease = demo = False
+    revision = 0.0
+    dump = 0
+
+    for paren, bracket in TAG_PATTERN.findall(file_name or ''):
+        if bracket:
+            flag = bracket.strip().lower()
+            if flag[:1] in DUMP_FLAG_RANKS and (len(flag) == 1 or flag[1:2].isdigit()):
+                dump = max(dump, DUMP_FLAG_RANKS[flag[:1]])
+            continue
+
+        tokens = [token.strip() for token in paren.split(',')]
+        for token in tokens:
+            lowered = token.lower()
+            region = normalize_region(token) if len(token) > 1 else None
+            if region:
+                regions.append(region)
+            elif len(tokens) == 1 and _is_goodtools_code(token):
+                regions.extend(REGION_ALIASES[code.lower()] for code in token)
+            elif lowered.startswith(PRERELEASE_TAGS):
+                prerelease = True
+            elif lowered.startswith(DEMO_TAGS):
+                demo = True
+            else:
+                number = _revision_number(lowered)
+                if number is not None:
+                    revision = max(revision, number)
+
+    return FileTags(tuple(dict.fromkeys(regions)), prerelease, demo, revision, dump)
+
+def rom_tags(rom: Dict) -> FileTags:
+    """Tags for a ROM, using the copy precomputed by the catalog when there is one."""
+    tags = rom.get('_rank_tags')
+    if tags is None:
+        tags = parse_tags(rom.get('file_name') or '')
+    return tags
+
+class RegionPreference:
+    """A compiled region order and revision policy for one server."""
+    def __init__(self, regions: Iterable[str] = ('USA', 'WORLD'), revision: str = 'any'):
+        self.regions = tuple(dict.fromkeys(regions))
+        self.revision = revision if revision in REVISION_CHOICES else 'any'
+        self._rank = {region: rank for rank, region in enumerate(self.regions)}
+
+    def file_priority(self, tags: FileTags) -> Tuple[int, int]:
+        """(tier, region rank) for a file, lower sorts first.
+
+        Tiers: preferred-region releases, preferred-region betas/prototypes, other
+        releases, demos, other betas/prototypes, then demo betas.
+        """
+        rank = min((self._rank[region] for region in tags.regions if region in self._rank),
+                   default=len(self.regions))
+        if rank < len(self.regions):
+            return (1 if tags.prerelease else 0), rank
+        if tags.demo:
+            return (5 if tags.prerelease else 3), rank
+        return (4 if tags.prerelease else 2), rank
+
+    def sort_key(self, rom: Dict) -> tuple:
+        """Sort key: title, then release priority, dump quality, revision and file name."""
+        game_name = rom['name'].lower()
+        if game_name.startswith("the "):
+            game_name = game_name[4:]
+        tags = rom_tags(rom)
+        tier, rank = self.file_priority(tags)
+        if self.revision == 'latest':
+            revision = -tags.revision
+        elif self.revision == 'original':
+            revision = tags.revision
+        else:
+            revision = 0
+        return (game_name, tier, rank, tags.dump, revision, (rom.get('file_name') or '').lower())
+
+    def describe(self) -> str:
+        return f"{', '.join(self.regions) or 'none'} (revision: {self.revision})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'regions': list(self.regions), 'revision': self.revision}
+
+DEFAULT_PREFERENCE = RegionPreference()
+
+class RegionRanker:
+    """Per-server region and revision preferences for ordering search results, saved to JSON."""
+    def __init__(self, prefs_file: str = "data/region_prefs.json"):
+        self.prefs_file = prefs_file
+        self.preferences: Dict[int, RegionPreference] = self.load_preferences()
+
+    def load_preferences(self) -> Dict[int, RegionPreference]:
+        """Load saved server preferences, skipping anything unreadable."""
+        if not os.path.exists(self.prefs_file):
+            return {}
+        try:
+            with open(self.prefs_file, 'r') as f:
+                data = json.load(f)
+            return {
+                int(guild_id): RegionPreference(prefs.get('regions', ()), prefs.get('revision', 'any'))
+                for guild_id, prefs in data.items()
+            }
+        except Exception as e:
+            logger.error(f"Error loading region preferences: {e}")
+            return {}
+
+    def save_preferences(self):
+        os.makedirs(os.path.dirname(self.prefs_file) or '.', exist_ok=True)
+        with open(self.prefs_file, 'w') as f:
+            json.dump({str(guild_id): prefs.to_dict() for guild_id, prefs in self.preferences.items()}, f, indent=2)
+
+    def preference(self, guild_id: Optional[int]) -> RegionPreference:
+        return self.preferences.get(guild_id, DEFAULT_PREFERENCE)
+
+    def key_for(self, guild_id: Optional[int]) -> Callable[[Dict], tuple]:
+        """Sort key function for a server's search results."""
+        return self.preference(guild_id).sort_key
+
+    def set_preference(self, guild_id: int, regions: Iterable[str], revision: str = 'any') -> RegionPreference:
+        preference = RegionPreference(regions, revision)
+        self.preferences[guild_id] = preference
+        self.save_preferences()
+        return preference
+
+    def reset(self, guild_id: int):
+        if self.preferences.pop(guild_id, None) is not None:
+            self.save_preferences()
@@ -220,7 +220,7 @@ class Request(commands.Cog):
         """Set up database and initialize IGDB client"""
         await self.setup_database()
         try:
-            self.igdb = IGDBClient()
+            self.igdb = IGDBClient(self.bot.http_pool)
         except ValueError as e:
             logger.warning(f"IGDB integration disabled: {e}")
             self.igdb = None
@@ -256,23 +256,14 @@ class Request(commands.Cog):
         """Check if a game already exists in the database"""
         try:
             # First get platform ID
-            platforms_data = self.bot.cache.get('platforms')
-            if not platforms_data:
-                platforms_data = await self.bot.fetch_api_endpoint('platforms')
-
-            platform_id = None
-            for p in platforms_data:
-                if p.get('name', '').lower() == platform.lower():
-                    platform_id = p.get('id')
-                    break
-
-            if not platform_id:
+            platform_index = await self.bot.ensure_platform_index()
+            platform_data = platform_index.find(platform)
+            if not platform_data:
                 return False, []
+            platform_id = platform_data['id']
 
             # Search for the game
-            search_results = await self.bot.fetch_api_endpoint(
-                f'roms?platform_id={platform_id}&search_term={game_name}&limit=25'
-            )
+            search_results = await self.bot.search_roms(platform_id, game_name, limit=25)
 
             if not search_results or not isinstance(search_results, list):
                 return False, []
@@ -526,29 +517,19 @@ class Request(commands.Cog):
 
         try:
             # Validate platform
-            raw_platforms = await self.bot.fetch_api_endpoint('platforms')
-            if not raw_platforms:
+            platform_index = await self.bot.ensure_platform_index()
+            if not platform_index.platforms:
                 await ctx.respond("❌ Unable to fetch platforms data")
                 return
             
-            platform_id = None
-            platform_name = None
-            sanitized_platforms = self.bot.sanitize_data(raw_platforms, data_type='platforms')
-            
-            for p in sanitized_platforms:
-                if p['name'].lower() == platform.lower():
-                    platform_id = p['id']
-                    platform_name = p['name']
-                    break
-                    
-            if not platform_id:
-                platforms_list = "\n".join(
-                    f"• {self.bot.get_cog('Search').get_platform_with_emoji(p['name'])}" 
-                    for p in sorted(sanitized_platforms, key=lambda x: x['name'])
-                )
-                await ctx.respond(f"❌ Platform '{platform}' not found. Available platforms:\n{platforms_list}")
+            platform_data = platform_index.find(platform)
+            if not platform_data:
+                await ctx.respond(f"❌ Platform '{platform}' not found. Available platforms:\n{platform_index.available_list}")
                 return
 
+            platform_id = platform_data['id']
+            platform_name = platform_data['name']
+
             # Check if game exists in current collection
             exists, matches = await self.check_if_game_exists(platform_name, game)
             
@@ -52,6 +52,7 @@ class Scan(commands.Cog):
         self.is_scanning: bool = False
         self.last_scan_stats: Dict[str, Any] = {}
         self.new_games: List[Dict[str, str]] = []
+        self.scanned_platforms: List[str] = []  # Slugs touched by the current scan
         self.setup_socket_handlers()
 
         logging.getLogger('socketio').setLevel(logging.WARNING)
@@ -92,6 +93,8 @@ class Scan(commands.Cog):
         @self.sio.on('scan:scanning_platform')
         async def on_scanning_platform(data):
             try:
+                if isinstance(data, dict) and data.get('slug'):
+                    self.scanned_platforms.append(data['slug'])
                 if self.last_channel:
                     if isinstance(data, dict):
                         platform_name = data.get('name', 'Unknown Platform')
@@ -113,6 +116,8 @@ class Scan(commands.Cog):
         async def on_scanning_rom(data):
             try:
                 if isinstance(data, dict):
+                    # Cached details of a rescanned ROM may be out of date
+                    self.bot.dispatch('rom_scanned', data)
                     rom_name = data.get('name', 'Unknown ROM')
                     self.scan_progress['current_rom'] = rom_name
                     self.scan_progress['platform_roms'] = self.scan_progress.get('platform_roms', 0) + 1
@@ -186,7 +191,10 @@ class Scan(commands.Cog):
                 # If there are new games, dispatch the batch event
                 if self.new_games:
                     logger.info(f"Dispatching batch_scan_complete with {len(self.new_games)} new games")
-                    await self.bot.dispatch('batch_scan_complete', self.new_games)
+                    self.bot.dispatch('batch_scan_complete', self.new_games)
+
+                # Let the bot re-sync anything cached about the scanned platforms
+                self.bot.dispatch('scan_complete', list(self.scanned_platforms))
                 
                 # Reset scan state
                 self._reset_scan_state()
@@ -207,6 +215,7 @@ class Scan(commands.Cog):
         }
         self.is_scanning = False
         self.new_games = []  # Reset new games list
+        self.scanned_platforms = []
 
     async def _handle_connection_error(self, error: str):
         """Handle connection errors and notify the user"""
@@ -349,23 +358,18 @@ class Scan(commands.Cog):
     async def _scan_platform(self, ctx: discord.ApplicationContext, platform: str):
         """Handle platform-specific scan"""
         try:
-            platforms_data = self.bot.cache.get('platforms')
+            platform_index = await self.bot.ensure_platform_index()
             
-            if not platforms_data:
+            if not platform_index.platforms:
                 await ctx.respond("❌ Error: Platform data not available")
                 return
             
-            platform_id = None
-            platform_name = None
-            for p in platforms_data:
-                if p.get('name', '').lower() == platform.lower():
-                    platform_id = p.get('id')
-                    platform_name = p.get('name')
-                    break
-            
-            if not platform_id:
+            platform_data = platform_index.find(platform)
+            if not platform_data:
                 await ctx.respond(f"❌ Platform '{platform}' not found")
                 return
+            platform_id = platform_data['id']
+            platform_name = platform_data['name']
 
             await self.ensure_connected()
             
@@ -393,6 +397,7 @@ class Scan(commands.Cog):
             }
             
             self.new_games = []
+            self.scanned_platforms = []
             await self.sio.emit('scan', options)
             await ctx.respond("🔍 Started single platform scan")
             
@@ -409,6 +414,7 @@ class Scan(commands.Cog):
         self.scan_start_time = datetime.now()
         self.is_scanning = True
         self.new_games = []
+        self.scanned_platforms = []
 
         # Initialize scan progress for full scan
         self.scan_progress = {
@@ -3,7 +3,7 @@ import discord
 import logging
 import re
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Union, Tuple, Callable, Awaitable
 import random
 import qrcode
 from PIL import Image
@@ -11,9 +11,15 @@ import io
 import aiohttp
 from io import BytesIO
 import asyncio
+import heapq
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from bisect import bisect_left
 from urllib.parse import quote
 
+from cogs.ranker import RegionRanker, DEFAULT_PREFERENCE, REVISION_CHOICES, normalize_region
+
 # Set up logging
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -23,44 +29,365 @@ formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(messag
 console_handler.setFormatter(formatter)
 logger.addHandler(console_handler)
 
+def sort_roms(rom: Dict) -> tuple:
+    """Sort key for search results using the default USA-first region priority."""
+    return DEFAULT_PREFERENCE.sort_key(rom)
+
+class RomRecord:
+    """The few fields a result list needs from a ROM, without the rest of the API payload.
+
+    Reads like a dict for those fields (rom['name'], rom.get('file_name')) so sort keys
+    and helpers work on records and full ROM dicts alike. Full details are fetched
+    through the bot's ROM detail cache when a result is opened.
+    """
+    __slots__ = ('id', 'name', 'file_name', 'file_size_bytes', 'platform_id', '_rank_tags')
+
+    def __init__(self, id: int, name: str, file_name: str = '', file_size_bytes: int = 0,
+                 platform_id: Optional[int] = None, rank_tags=None):
+        self.id = id
+        self.name = name
+        self.file_name = file_name
+        self.file_size_bytes = file_size_bytes
+        self.platform_id = platform_id
+        self._rank_tags = rank_tags
+
+    @classmethod
+    def from_rom(cls, rom: Union[Dict, "RomRecord"]) -> "RomRecord":
+        if isinstance(rom, cls):
+            return rom
+        size_bytes = rom.get('file_size_bytes', 0)
+        if not size_bytes and rom.get('files'):
+            # For multi-file ROMs, sum the sizes
+            size_bytes = sum(f.get('size_bytes', 0) for f in rom['files'])
+        return cls(
+            rom['id'], rom.get('name') or rom.get('file_name', ''), rom.get('file_name', ''),
+            size_bytes or 0, rom.get('platform_id'), rom.get('_rank_tags')
+        )
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.__slots__ if key != '_rank_tags'}
+
+def render_qr_png(url: str) -> bytes:
+    """Encode a URL as a QR code PNG. CPU bound, so it runs in a worker thread."""
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=2,
+    )
+    qr.add_data(url)
+    qr.make(fit=True)
+
+    qr_img = qr.make_image(fill_color="black", back_color="white")
+
+    byte_arr = BytesIO()
+    qr_img.save(byte_arr, format='PNG')
+    return byte_arr.getvalue()
+
+class QRCodeCache:
+    """QR code PNGs rendered off the event loop and kept in a byte-bounded LRU keyed by download URL."""
+    # Upper bounds of the render latency histogram buckets, in milliseconds
+    LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000)
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024, workers: int = 2):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.pngs: "OrderedDict[str, bytes]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='qr')
+        self.stats: Dict[str, int] = {'hits': 0, 'renders': 0, 'evictions': 0}
+        self.histogram = [0] * (len(self.LATENCY_BUCKETS) + 1)
+
+    async def get(self, url: str) -> bytes:
+        """PNG bytes for a URL, rendering it in the thread pool on a miss."""
+        png = self.pngs.get(url)
+        if png is not None:
+            self.stats['hits'] += 1
+            self.pngs.move_to_end(url)
+            return png
+
+        # Concurrent requests for the same URL share one render
+        future = self._inflight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self._render(url))
+            self._inflight[url] = future
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(future)
+
+    async def _render(self, url: str) -> bytes:
+        started = time.perf_counter()
+        png = await asyncio.get_running_loop().run_in_executor(self._executor, render_qr_png, url)
+        self.record_latency((time.perf_counter() - started) * 1000)
+        self.stats['renders'] += 1
+        self.pngs[url] = png
+        self.total_bytes += len(png)
+        while self.total_bytes > self.max_bytes and len(self.pngs) > 1:
+            _, evicted = self.pngs.popitem(last=False)
+            self.total_bytes -= len(evicted)
+            self.stats['evictions'] += 1
+        return png
+
+    def record_latency(self, ms: float):
+        self.histogram[bisect_left(self.LATENCY_BUCKETS, ms)] += 1
+
+    def summary(self) -> str:
+        labels = [f"<={bound}ms" for bound in self.LATENCY_BUCKETS] + [f">{self.LATENCY_BUCKETS[-1]}ms"]
+        buckets = ' '.join(f"{label}={count}" for label, count in zip(labels, self.histogram) if count)
+        return (
+            f"{self.stats['renders']} rendered, {self.stats['hits']} cached, {self.stats['evictions']} evicted, "
+            f"{len(self.pngs)} entries ({self.total_bytes / 1024:.0f} KB), latency: {buckets or 'none'}"
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+class FileListing:
+    """File names and sizes of a multi-file ROM, sorted once and shared by the embed and the file picker."""
+    # Files summarized in the embed when a ROM has more than this many
+    EMBED_FILES = 10
+
+    def __init__(self, files: List[Dict]):
+        entries = sorted(
+            ((f.get('filename', ''), f.get('size_bytes', 0) or f.get('size', 0)) for f in files),
+            key=lambda entry: entry[0].lower()
+        )
+        self.names: List[str] = [name for name, _ in entries]
+        self.sizes: List[int] = [size for _, size in entries]
+        self.total_size = sum(self.sizes)
+        # Large sets show their biggest files in the embed, small ones every file by name
+        if len(entries) > self.EMBED_FILES:
+            self.embed_indices = heapq.nlargest(self.EMBED_FILES, range(len(entries)), key=self.sizes.__getitem__)
+        else:
+            self.embed_indices = list(range(len(entries)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def page(self, page: int, page_size: int) -> range:
+        """Indices of the files on one page of the picker."""
+        start = page * page_size
+        return range(start, min(start + page_size, len(self.names)))
+
+    def page_count(self, page_size: int) -> int:
+        return max(1, -(-len(self.names) // page_size))
+
+class QRTriggerDispatcher:
+    """Routes QR triggers, a 'qr' reply or a QR reaction, to the view that owns the message.
+
+    Watched messages are indexed by id, so each event is one dict lookup however many
+    views are open. Watches expire on a timer wheel of one-second slots, turned by a
+    single task that only runs while something is being watched.
+    """
+    VALID_EMOJIS = {'qr_code', '📱', 'qr'}
+
+    def __init__(self, timeout: int = 60, slots: int = 64):
+        self.timeout = timeout
+        # message id -> (view, interaction, tick at which the watch expires)
+        self.watched: Dict[int, Tuple["ROM_View", discord.Interaction, int]] = {}
+        self.wheel: List[set] = [set() for _ in range(max(slots, timeout + 1))]
+        self.tick = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def watch(self, message_id: int, view: "ROM_View", interaction: discord.Interaction):
+        """Watch a message for QR triggers, restarting the timeout if it is already watched."""
+        self._take(message_id)
+        expires = self.tick + self.timeout
+        self.watched[message_id] = (view, interaction, expires)
+        self.wheel[expires % len(self.wheel)].add(message_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._turn_wheel())
+
+    def _take(self, message_id: int) -> Optional[Tuple["ROM_View", discord.Interaction, int]]:
+        """Stop watching a message and return its entry."""
+        entry = self.watched.pop(message_id, None)
+        if entry:
+            self.wheel[entry[2] % len(self.wheel)].discard(message_id)
+        return entry
+
+    async def _turn_wheel(self):
+        """Advance one slot per second and expire the watches due in it."""
+        while self.watched:
+            await asyncio.sleep(1)
+            self.tick += 1
+            for message_id in list(self.wheel[self.tick % len(self.wheel)]):
+                if self.watched[message_id][2] <= self.tick:
+                    self._take(message_id)
+                    logger.info("QR code trigger watch timed out")
+
+    async def dispatch_message(self, message: discord.Message):
+        """Handle a reply saying 'qr' to a watched message."""
+        reference = message.reference
+        if not reference or reference.message_id not in self.watched or 'qr' not in message.content.lower():
+            return
+        view, interaction, _ = self._take(reference.message_id)
+        await view.handle_qr_trigger(interaction, "message reply")
+
+    async def dispatch_reaction(self, reaction: discord.Reaction, user: discord.abc.User):
+        """Handle a QR reaction on a watched message by the user who ran the command."""
+        entry = self.watched.get(reaction.message.id)
+        if not entry or user.id != entry[0].author_id:
+            return
+        if getattr(reaction.emoji, 'name', str(reaction.emoji)).lower() not in self.VALID_EMOJIS:
+            return
+        view, interaction, _ = self._take(reaction.message.id)
+        await view.handle_qr_trigger(interaction, f"reaction {reaction.emoji}")
+
+    def close(self):
+        """Drop every watch and stop the wheel."""
+        if self._task:
+            self._task.cancel()
+        self.watched.clear()
+        for slot in self.wheel:
+            slot.clear()
+
 class ROM_View(discord.ui.View):
-    def __init__(self, bot, search_results: List[Dict], author_id: int, platform_name: Optional[str] = None, initial_message: Optional[discord.Message] = None):
+    # Results per page (Discord's select option limit) and how many seen pages each view keeps
+    PAGE_SIZE = 25
+    PAGE_CACHE_SIZE = 3
+    # Rendered embed payloads shared by every view, keyed by ROM id, detail version and platform display
+    EMBED_CACHE_SIZE = 256
+    _embed_cache: "OrderedDict[tuple, Dict]" = OrderedDict()
+    # Files per page of the file picker, and sorted file listings kept for recently opened ROMs
+    FILE_PAGE_SIZE = 25
+    FILE_LISTING_CACHE_SIZE = 64
+    _file_listings: "OrderedDict[tuple, FileListing]" = OrderedDict()
+
+    def __init__(self, bot, search_results: List[Dict], author_id: int, platform_name: Optional[str] = None,
+                 initial_message: Optional[discord.Message] = None,
+                 page_loader: Optional[Callable[[int, int], Awaitable[List[Dict]]]] = None, has_more: bool = False,
+                 sort_key: Callable[[Dict], tuple] = sort_roms):
         super().__init__()
         self.bot = bot
-        self.search_results = search_results
+        self.search_results = [RomRecord.from_rom(rom) for rom in search_results[:self.PAGE_SIZE]]
         self.author_id = author_id
         self.platform_name = platform_name
         self.message = initial_message
         self._selected_rom = None
 
+        # Paging: page_loader(offset, limit) fetches later pages on demand
+        self.page_loader = page_loader
+        self.sort_key = sort_key
+        self.page = 0
+        self.has_more = has_more
+        self._page_cache: "OrderedDict[int, Tuple[List[Dict], bool]]" = OrderedDict()
+        self._page_cache[0] = (self.search_results, has_more)
+        self._paging_items: List[discord.ui.Item] = []
+
         # Create ROM select menu only
         self.select = discord.ui.Select(
             placeholder="Select result to view details",
             custom_id="rom_select"
         )
+        self._populate_select()
+        
+        self.select.callback = self.select_callback
+        self.add_item(self.select)
+
+        if page_loader and has_more:
+            self.prev_button = discord.ui.Button(label="◀ Previous", style=discord.ButtonStyle.secondary, row=4, disabled=True)
+            self.next_button = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.secondary, row=4)
+            self.prev_button.callback = self.previous_page_callback
+            self.next_button.callback = self.next_page_callback
+            self._paging_items = [self.prev_button, self.next_button]
+            for button in self._paging_items:
+                self.add_item(button)
+
+    def _is_file_component(self, item: discord.ui.Item) -> bool:
+        """File selects and download buttons, as opposed to the result select and paging buttons."""
+        return (isinstance(item, (discord.ui.Button, discord.ui.Select))
+                and item is not self.select and item not in self._paging_items)
+
+    def _populate_select(self):
+        """Fill the result select with the current page."""
+        self.select.options = []
+        if self.page_loader and (self.page or self.has_more):
+            self.select.placeholder = f"Select result to view details (page {self.page + 1})"
         
         # Add options to select menu
-        for rom in search_results[:25]:
-            display_name = rom['name'][:75] if len(rom['name']) > 75 else rom['name']
-            file_name = rom.get('file_name', 'Unknown filename')
-            
-            # Get correct size for dropdown
-            size_bytes = rom.get('file_size_bytes', 0)
-            if not size_bytes and rom.get('files'):
-                # For multi-file ROMs, sum the sizes
-                size_bytes = sum(f.get('size_bytes', 0) for f in rom['files'])
-            file_size = self.format_file_size(size_bytes)
+        for rom in self.search_results:
+            display_name = rom.name[:75]
+            file_name = rom.file_name or 'Unknown filename'
+            file_size = self.format_file_size(rom.file_size_bytes)
             
             truncated_filename = (file_name[:47] + '...') if len(file_name) > 50 else file_name
+            description = f"{truncated_filename} ({file_size})"
+
+            # Results from several platforms say which one each ROM is on
+            if not self.platform_name and (platform := self.bot.platform_index.get(rom.platform_id)):
+                description = f"{platform['name'][:30]} | {description}"
             
             self.select.add_option(
                 label=display_name,
-                value=str(rom['id']),
-                description=f"{truncated_filename} ({file_size})"
+                value=str(rom.id),
+                description=description[:100]
             )
-        
-        self.select.callback = self.select_callback
-        self.add_item(self.select)
+
+    async def _load_page(self, page: int) -> Optional[Tuple[List[Dict], bool]]:
+        """Get a page from the view's small cache or fetch it through the page loader."""
+        if page in self._page_cache:
+            self._page_cache.move_to_end(page)
+            return self._page_cache[page]
+
+        results = await self.page_loader(page * self.PAGE_SIZE, self.PAGE_SIZE + 1)
+        if not results:
+            return None
+        has_more = len(results) > self.PAGE_SIZE
+        results = [RomRecord.from_rom(rom) for rom in results[:self.PAGE_SIZE]]
+        # Guard against an API that ignores the offset and serves the same page again.
+        # Compare ids, not first rows: the current page has been re-sorted by region.
+        if self.search_results and {rom.id for rom in results} == {rom.id for rom in self.search_results}:
+            return None
+        results.sort(key=self.sort_key)
+
+        self._page_cache[page] = (results, has_more)
+        while len(self._page_cache) > self.PAGE_CACHE_SIZE:
+            self._page_cache.popitem(last=False)
+        return results, has_more
+
+    async def _change_page(self, interaction: discord.Interaction, delta: int):
+        """Move to the previous or next page of results."""
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("These buttons aren't for you!", ephemeral=True)
+            return
+
+        await interaction.response.defer()
+        try:
+            page = self.page + delta
+            loaded = await self._load_page(page) if page >= 0 else None
+            if not loaded:
+                if delta > 0:
+                    self.has_more = False
+                    self.next_button.disabled = True
+                    await interaction.message.edit(view=self)
+                    await interaction.followup.send("No more results", ephemeral=True)
+                else:
+                    await interaction.followup.send("❌ Couldn't load the previous page, try again", ephemeral=True)
+                return
+
+            self.page = page
+            self.search_results, self.has_more = loaded
+            self._populate_select()
+            self.prev_button.disabled = self.page == 0
+            self.next_button.disabled = not self.has_more
+            self.message = await interaction.message.edit(view=self)
+        except Exception as e:
+            logger.error(f"Error changing result page: {e}")
+            await interaction.followup.send("❌ An error occurred while loading more results", ephemeral=True)
+
+    async def previous_page_callback(self, interaction: discord.Interaction):
+        await self._change_page(interaction, -1)
+
+    async def next_page_callback(self, interaction: discord.Interaction):
+        await self._change_page(interaction, 1)
 
     @staticmethod
     def format_file_size(size_bytes: Union[int, float]) -> str:
@@ -76,7 +403,39 @@ class ROM_View(discord.ui.View):
             unit_index += 1
         return f"{size_value:.2f} {units[unit_index]}"
 
+    @staticmethod
+    def detail_version(rom_data: Dict) -> tuple:
+        """What a ROM's embed depends on; a rescan that changes any of it changes the key."""
+        return (
+            rom_data.get('updated_at'), rom_data.get('name'), rom_data.get('file_name'),
+            rom_data.get('file_size_bytes'), rom_data.get('url_cover'), rom_data.get('multi'),
+            len(rom_data.get('files') or ()), hash(rom_data.get('summary'))
+        )
+
+    def platform_display_for(self, rom_data: Dict) -> Optional[str]:
+        """Platform shown in a ROM's embed, from the view or else from the ROM itself."""
+        platform_name = self.platform_name
+        if not platform_name and (platform_id := rom_data.get('platform_id')):
+            platform = self.bot.platform_index.get(platform_id)
+            if platform:
+                platform_name = platform['name']
+        return self.bot.platform_index.display(platform_name) if platform_name else None
+
     async def create_rom_embed(self, rom_data: Dict) -> discord.Embed:
+        """ROM embed, rendered once per ROM version and platform display and then rebuilt from its payload."""
+        key = (rom_data.get('id'), self.detail_version(rom_data), self.platform_display_for(rom_data))
+        payload = self._embed_cache.get(key)
+        if payload is not None:
+            self._embed_cache.move_to_end(key)
+            return discord.Embed.from_dict(payload)
+
+        embed = await self.build_rom_embed(rom_data)
+        self._embed_cache[key] = embed.to_dict()
+        while len(self._embed_cache) > self.EMBED_CACHE_SIZE:
+            self._embed_cache.popitem(last=False)
+        return embed
+
+    async def build_rom_embed(self, rom_data: Dict) -> discord.Embed:
         try:
             file_name = rom_data.get('file_name', 'unknown_file').replace(' ', '%20')
             download_url = f"{self.bot.config.DOMAIN}/api/roms/{rom_data['id']}/content/{file_name}"
@@ -99,21 +458,7 @@ class ROM_View(discord.ui.View):
                 embed.set_image(url=cover_url)
             
             # Get platform name if not provided
-            platform_name = self.platform_name
-            if not platform_name and (platform_id := rom_data.get('platform_id')):
-                platforms_data = self.bot.cache.get('platforms')
-                if platforms_data:
-                    for p in platforms_data:
-                        if p.get('id') == platform_id:
-                            platform_name = p.get('name', 'Unknown Platform')
-                            break
-            
-            if platform_name:
-                search_cog = self.bot.get_cog('Search')
-                if search_cog:
-                    platform_display = search_cog.get_platform_with_emoji(platform_name)
-                else:
-                    platform_display = platform_name
+            if platform_display := self.platform_display_for(rom_data):
                 embed.add_field(name="Platform", value=platform_display, inline=True)
             
             # Add other metadata fields
@@ -155,97 +500,10 @@ class ROM_View(discord.ui.View):
             
             # File information
             if rom_data.get('multi') and rom_data.get('files'):
-                files = rom_data.get('files', [])
-                total_size = sum(f.get('size_bytes', 0) if f.get('size_bytes', 0) else f.get('size', 0) for f in files)
-                files_info = []
-                total_length = 0
-                files_shown = 0
-                total_files = len(files)
-                max_length = 800  # Leave buffer for Discord's limit
-
-                def would_exceed_limit(current_text: str, new_line: str) -> bool:
-                    """Check if adding a new line would exceed Discord's limit"""
-                    potential_total = len('\n'.join(current_text + [new_line]))
-                    return potential_total > max_length
-                
-                # Sort files based on count
-                if len(files) > 10:
-                    sorted_files = sorted(
-                        files, 
-                        key=lambda x: x.get('size_bytes', 0) if x.get('size_bytes', 0) else x.get('size', 0), 
-                        reverse=True
-                    )[:10]
-                else:
-                    sorted_files = sorted(
-                        files,
-                        key=lambda x: x.get('filename', '').lower()
-                    )
-
-                # Process each file
-                for file_info in sorted_files:
-                    # Get file size
-                    size_bytes = file_info.get('size_bytes', 0)
-                    if not size_bytes and 'size' in file_info:
-                        size_bytes = file_info.get('size', 0)
-                    size_str = self.format_file_size(size_bytes)
-
-                    # Create file line
-                    file_line = f"• {file_info['filename']} ({size_str})"
-                    line_length = len(file_line) + 1  # +1 for newline
-                    
-                    if total_length + line_length > max_length:
-                        files_info.append("...")
-                        break
-                    
-                    # Add file line
-                    files_info.append(file_line)
-                    total_length += line_length
-                    files_shown += 1  # Increment counter when file is actually added
-                 
-                    # Get hash information
-                    # hashes = []
-                    # if crc := file_info.get('crc_hash'):
-                    #    hashes.append(f"CRC: {crc}")
-                    # if md5 := file_info.get('md5_hash'):
-                    #    hashes.append(f"MD5: {md5}")
-                    # if sha1 := file_info.get('sha1_hash'):
-                    #    hashes.append(f"SHA1: {sha1}")
-
-                    # Add hash line if we have hashes and room
-                    # if hashes:
-                    #    hash_line = "  " + " | ".join(hashes)
-                    #    if not would_exceed_limit(files_info, hash_line):
-                    #        files_info.append(hash_line)
-
-                    
-                # Create field name
-                field_name = f"Files (Total: {self.format_file_size(total_size)}"
-                if len(files) > files_shown:
-                    field_name += f" - Showing {files_shown} of {(total_files)} files)"
-                else:
-                    field_name += ")"
-
-                 # Verify final length
-                final_text = "\n".join(files_info)
-                if len(final_text) > 1024:
-                    # If somehow still too long, truncate and show fewer files
-                    files_info = files_info[:len(files_info)//2]
-                    if files_info[-1] != "...":
-                        files_info.append("...")
-                    final_text = "\n".join(files_info)
-                    files_shown = sum(1 for line in files_info if line.startswith("•"))
-                    
-                    # Update field name with new count
-                    field_name = f"Files (Total: {self.format_file_size(total_size)}"
-                    if len(files) > files_shown:
-                        field_name += f" - Showing {files_shown} of {len(files)} files)"
-                    else:
-                        field_name += ")"
-                
-                # Add field to embed
+                field_name, field_value = self.files_field(self.file_listing(rom_data))
                 embed.add_field(
                     name=field_name,
-                    value="\n".join(files_info),
+                    value=field_value,
                     inline=False
                 )
             else:
@@ -279,6 +537,39 @@ class ROM_View(discord.ui.View):
             logger.error(f"Error creating ROM embed: {e}")
             raise
 
+    def file_listing(self, rom_data: Dict) -> FileListing:
+        """Sorted file metadata for a ROM, built once per ROM version."""
+        key = (rom_data.get('id'), self.detail_version(rom_data))
+        listing = self._file_listings.get(key)
+        if listing is None:
+            listing = FileListing(rom_data.get('files') or [])
+            self._file_listings[key] = listing
+            while len(self._file_listings) > self.FILE_LISTING_CACHE_SIZE:
+                self._file_listings.popitem(last=False)
+        else:
+            self._file_listings.move_to_end(key)
+        return listing
+
+    def files_field(self, listing: FileListing, max_length: int = 800) -> Tuple[str, str]:
+        """Name and value of the multi-file field, built in one pass within max_length characters."""
+        files_info = []
+        total_length = 0  # Leave buffer for Discord's 1024 character limit
+        for i in listing.embed_indices:
+            file_line = f"• {listing.names[i]} ({self.format_file_size(listing.sizes[i])})"
+            total_length += len(file_line) + 1  # +1 for newline
+            if total_length > max_length:
+                files_info.append("...")
+                break
+            files_info.append(file_line)
+
+        files_shown = len(files_info) - (files_info[-1:] == ["..."])
+        field_name = f"Files (Total: {self.format_file_size(listing.total_size)}"
+        if len(listing) > files_shown:
+            field_name += f" - Showing {files_shown} of {len(listing)} files)"
+        else:
+            field_name += ")"
+        return field_name, "\n".join(files_info)
+
     def trim_summary_to_lines(self, summary: str, max_lines: int = 3, chars_per_line: int = 60) -> str:
         """Trim summary text to specified number of lines"""
         if not summary:
@@ -321,22 +612,8 @@ class ROM_View(discord.ui.View):
     async def generate_qr(self, url: str) -> discord.File:
         """Generate QR code for download URL"""
         try:
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=10,
-                border=2,
-            )
-            qr.add_data(url)
-            qr.make(fit=True)
-            
-            qr_img = qr.make_image(fill_color="black", back_color="white")
-            
-            byte_arr = BytesIO()
-            qr_img.save(byte_arr, format='PNG')
-            byte_arr.seek(0)
-            
-            return discord.File(byte_arr, filename="download_qr.png")
+            png = await self.bot.qr_codes.get(url)
+            return discord.File(BytesIO(png), filename="download_qr.png")
         except Exception as e:
             logger.error(f"Error generating QR code: {e}")
             return None
@@ -347,61 +624,40 @@ class ROM_View(discord.ui.View):
             # Remove existing file components if they exist
             components_to_remove = []
             for item in self.children:
-                if isinstance(item, (discord.ui.Button, discord.ui.Select)) and item != self.select:
+                if self._is_file_component(item):
                     components_to_remove.append(item)
             
             for item in components_to_remove:
                 self.remove_item(item)
 
-            # Initialize filename map as instance variable
-            self.filename_map = {}
-
             if rom_data.get('multi') and rom_data.get('files'):
-                files = rom_data.get('files', [])
-                if not files:
+                self.file_listing_shown = self.file_listing(rom_data)
+                self.file_page = 0
+                if not len(self.file_listing_shown):
                     return
-                
-                # Sort files based on count
-                if len(files) > 10:
-                    sorted_files = sorted(
-                        files, 
-                        key=lambda x: x.get('size_bytes', 0) if x.get('size_bytes', 0) else x.get('size', 0), 
-                        reverse=True
-                    )[:10]
-                else:
-                    sorted_files = sorted(
-                        files,
-                        key=lambda x: x.get('filename', '').lower()
-                    )
-                
-                # Create file select with appropriate max_values
+
+                # Only the page on screen gets select options; the rest are built when paged to
                 self.file_select = discord.ui.Select(
                     placeholder="Select files to download",
                     custom_id="file_select",
                     min_values=1,
-                    max_values=min(len(sorted_files), 25)
+                    row=1
                 )
-                
-                # Add file options using shortened values
-                for i, file_info in enumerate(sorted_files):
-                    # Get size from file info
-                    size_bytes = file_info.get('size_bytes', 0)
-                    if not size_bytes and 'size' in file_info:
-                        size_bytes = file_info.get('size', 0)
-                    size = self.format_file_size(size_bytes)
-                    
-                    # Create shortened value and map it to full filename
-                    short_value = f"file_{i}"
-                    self.filename_map[short_value] = file_info['filename']
-                    
-                    self.file_select.add_option(
-                        label=file_info['filename'][:75],
-                        value=short_value,  # Use shortened value
-                        description=f"Size: {size}"
-                    )
-                
                 self.file_select.callback = self.file_select_callback
                 self.add_item(self.file_select)
+                self._populate_file_select()
+
+                if self.file_listing_shown.page_count(self.FILE_PAGE_SIZE) > 1:
+                    self.prev_files_button = discord.ui.Button(
+                        label="◀ Files", style=discord.ButtonStyle.secondary, row=3, disabled=True
+                    )
+                    self.next_files_button = discord.ui.Button(
+                        label="Files ▶", style=discord.ButtonStyle.secondary, row=3
+                    )
+                    self.prev_files_button.callback = self.previous_files_callback
+                    self.next_files_button.callback = self.next_files_callback
+                    self.add_item(self.prev_files_button)
+                    self.add_item(self.next_files_button)
 
                 # Add download buttons as URL buttons
                 file_name = quote(rom_data.get('file_name', 'unknown_file'))
@@ -412,7 +668,8 @@ class ROM_View(discord.ui.View):
                     label="Download Selected",
                     style=discord.ButtonStyle.link,
                     url=base_url,
-                    disabled=True
+                    disabled=True,
+                    row=2
                 )
                 self.add_item(self.download_selected)
 
@@ -420,7 +677,8 @@ class ROM_View(discord.ui.View):
                 self.download_all = discord.ui.Button(
                     label="Download All",
                     style=discord.ButtonStyle.link,
-                    url=base_url
+                    url=base_url,
+                    row=2
                 )
                 self.add_item(self.download_all)
 
@@ -443,6 +701,48 @@ class ROM_View(discord.ui.View):
             raise
 
 
+    def _populate_file_select(self):
+        """Fill the file select with the current page of files."""
+        listing = self.file_listing_shown
+        indices = listing.page(self.file_page, self.FILE_PAGE_SIZE)
+        self.file_select.options = []
+        self.file_select.max_values = len(indices)
+        if len(listing) > self.FILE_PAGE_SIZE:
+            self.file_select.placeholder = (
+                f"Select files to download ({indices.start + 1}-{indices.stop} of {len(listing)})"
+            )
+        for i in indices:
+            self.file_select.add_option(
+                label=listing.names[i][:75],
+                value=f"file_{i}",  # Short value, mapped back through the listing
+                description=f"Size: {self.format_file_size(listing.sizes[i])}"
+            )
+
+    async def _change_file_page(self, interaction: discord.Interaction, delta: int):
+        """Move the file picker to the previous or next page of files."""
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message("These buttons aren't for you!", ephemeral=True)
+            return
+
+        try:
+            page_count = self.file_listing_shown.page_count(self.FILE_PAGE_SIZE)
+            self.file_page = max(0, min(self.file_page + delta, page_count - 1))
+            self._populate_file_select()
+            self.prev_files_button.disabled = self.file_page == 0
+            self.next_files_button.disabled = self.file_page >= page_count - 1
+            # A selection from another page no longer applies
+            self.download_selected.disabled = True
+            await interaction.response.edit_message(view=self)
+        except Exception as e:
+            logger.error(f"Error changing file page: {e}")
+            await interaction.response.send_message("❌ An error occurred while loading more files", ephemeral=True)
+
+    async def previous_files_callback(self, interaction: discord.Interaction):
+        await self._change_file_page(interaction, -1)
+
+    async def next_files_callback(self, interaction: discord.Interaction):
+        await self._change_file_page(interaction, 1)
+
     async def file_select_callback(self, interaction: discord.Interaction):
         """Handle file selection"""
         if interaction.user.id != self.author_id:
@@ -452,11 +752,13 @@ class ROM_View(discord.ui.View):
         try:
             selected_short_values = interaction.data['values']
             logger.debug(f"Selected short values: {selected_short_values}")
-            logger.debug(f"Filename map: {self.filename_map}")
             
-            if selected_short_values and hasattr(self, 'filename_map'):
+            if selected_short_values and hasattr(self, 'file_listing_shown'):
                 # Convert short values back to full filenames
-                selected_file_names = [self.filename_map[short_value] for short_value in selected_short_values]
+                selected_file_names = [
+                    self.file_listing_shown.names[int(short_value.split('_', 1)[1])]
+                    for short_value in selected_short_values
+                ]
                 
                 # Create the URL based on number of files
                 base_file_name = self._selected_rom.get('file_name', 'unknown_file')
@@ -474,9 +776,10 @@ class ROM_View(discord.ui.View):
                 
                 logger.debug(f"Generated download URL: {download_url}")
                 
-                # Remove old download buttons
+                # Remove old download buttons, keeping the file page buttons
                 for item in self.children[:]:
-                    if isinstance(item, discord.ui.Button):
+                    if (isinstance(item, discord.ui.Button) and item.style == discord.ButtonStyle.link
+                            and self._is_file_component(item)):
                         self.remove_item(item)
                 
                 # Add new download selected button with updated URL
@@ -484,7 +787,8 @@ class ROM_View(discord.ui.View):
                     label="Download Selected",
                     style=discord.ButtonStyle.link,
                     url=download_url,
-                    disabled=False
+                    disabled=False,
+                    row=2
                 )
                 self.add_item(self.download_selected)
 
@@ -494,7 +798,8 @@ class ROM_View(discord.ui.View):
                 self.download_all = discord.ui.Button(
                     label="Download All",
                     style=discord.ButtonStyle.link,
-                    url=download_all_url
+                    url=download_all_url,
+                    row=2
                 )
                 self.add_item(self.download_all)
                 
@@ -620,132 +925,14 @@ class ROM_View(discord.ui.View):
             logger.error(f"Error handling QR code request: {e}")
             await interaction.channel.send("❌ An error occurred while generating the QR code")
 
-    async def start_watching_triggers(self, interaction: discord.Interaction):
-        """Start watching for QR code triggers"""
-        try:
-            # Ensure we have a valid message reference
-            if not self.message:
-                logger.warning("No message reference for QR code triggers")
-                return
-
-            def message_check(m):
-                # First verify the reference exists
-                if not m.reference or not hasattr(m.reference, 'cached_message'):
-                    return False
-                    
-                referenced_message = m.reference.cached_message
-                # Make sure we can access the referenced message
-                if not referenced_message:
-                    return False
-                    
-                return (
-                    any(keyword in m.content.lower() for keyword in {'qr'}) and
-                    referenced_message.author.id == self.bot.user.id and  # Check if referencing our bot
-                    referenced_message.embeds and  # Referenced message should have embed
-                    self.message.embeds and  # Original message should have embed
-                    referenced_message.embeds[0].title == self.message.embeds[0].title  # Compare embed titles
-                )  
-            def reaction_check(reaction, user):
-                # List of accepted emoji names and Unicode emojis
-                valid_emojis = {
-                    'qr_code',  # Custom emoji names
-                    '📱', 'qr'  # Unicode emojis and text alternatives
-                }
-                return (
-                    user.id == self.author_id and
-                    reaction.message.embeds and  # Ensure message has embeds
-                    self.message.embeds and  # Ensure original message has embeds
-                    reaction.message.embeds[0].title == self.message.embeds[0].title and  # Compare embeds
-                    (getattr(reaction.emoji, 'name', str(reaction.emoji)).lower() in valid_emojis)  # Check emoji safely
-                )
-            # Create tasks for both events
-            message_task = asyncio.create_task(
-                self.bot.wait_for(
-                    'message',
-                    timeout=60.0,
-                    check=message_check
-                )
-            )
-            
-            reaction_task = asyncio.create_task(
-                self.bot.wait_for(
-                    'reaction_add',
-                    timeout=60.0,
-                    check=reaction_check
-                )
-            )
-
-            # Wait for either task to complete
-            try:
-                done, pending = await asyncio.wait(
-                    [message_task, reaction_task],
-                    return_when=asyncio.FIRST_COMPLETED
-                )
-
-                # Cancel pending tasks
-                for task in pending:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-
-                # Get the result from the completed task
-                result = done.pop().result()
-                
-                if isinstance(result, discord.Message):
-                    trigger_type = "message reply"
-                else:
-                    reaction, user = result
-                    emoji_identifier = str(reaction.emoji.name) if hasattr(reaction.emoji, 'name') else str(reaction.emoji)
-                    trigger_type = f"reaction {reaction.emoji}"
-                
-                await self.handle_qr_trigger(interaction, trigger_type)
-
-            except asyncio.TimeoutError:
-                logger.info("QR code trigger watch timed out")
-                return
-
-        except Exception as e:
-            logger.error(f"Error watching for triggers: {e}")
-
     async def watch_for_qr_triggers(self, interaction: discord.Interaction):
         """Start watching for QR code triggers after ROM selection"""
         if not self.message:
             logger.warning("No message reference for QR code triggers")
             return
-            
-        await self.start_watching_triggers(interaction)
 
-    def message_check(self, m):
-        """Check if a message is a valid QR trigger"""
-        if not m.reference or not hasattr(m.reference, 'cached_message'):
-            return False
-            
-        referenced_message = m.reference.cached_message
-        if not referenced_message:
-            return False
-            
-        return (
-            any(keyword in m.content.lower() for keyword in {'qr'}) and
-            referenced_message.author.id == self.bot.user.id and
-            referenced_message.embeds and
-            self.message.embeds and
-            referenced_message.embeds[0].title == self.message.embeds[0].title
-        )
-        
-    def reaction_check(self, reaction, user):
-        """Check if a reaction is a valid QR trigger"""
-        valid_emojis = {'qr_code', '📱', 'qr'}
-        return (
-            user.id == self.author_id and
-            reaction.message.embeds and
-            self.message.embeds and
-            reaction.message.embeds[0].title == self.message.embeds[0].title and
-            (getattr(reaction.emoji, 'name', str(reaction.emoji)).lower() in valid_emojis)
-        )    
-    
-    
+        self.bot.qr_triggers.watch(self.message.id, self, interaction)
+
     async def select_callback(self, interaction: discord.Interaction):
         """Handle ROM selection"""
         if interaction.user.id != self.author_id:
@@ -756,23 +943,25 @@ class ROM_View(discord.ui.View):
         
         try:
             selected_rom_id = int(interaction.data['values'][0])
-            selected_rom = next((rom for rom in self.search_results if rom['id'] == selected_rom_id), None)
+            selected_record = next((rom for rom in self.search_results if rom.id == selected_rom_id), None)
             
-            if selected_rom:
+            if selected_record:
+                # Full details live in the bot's ROM detail cache, the view only keeps the record
+                selected_rom = selected_record.to_dict()
                 try:
-                    detailed_rom = await self.bot.fetch_api_endpoint(f'roms/{selected_rom_id}')
+                    detailed_rom = await self.bot.fetch_rom_details(selected_rom_id)
                     if detailed_rom:
-                        selected_rom.update(detailed_rom)
+                        selected_rom = detailed_rom
                 except Exception as e:
                     logger.error(f"Error fetching detailed ROM data: {e}")
                 
-                self._selected_rom = selected_rom
+                self._selected_rom = RomRecord.from_rom(selected_rom)
                 embed = await self.create_rom_embed(selected_rom)
                 
                 # Remove all file-related components first
                 components_to_remove = []
                 for item in self.children[:]:
-                    if isinstance(item, (discord.ui.Button, discord.ui.Select)) and item != self.select:
+                    if self._is_file_component(item):
                         components_to_remove.append(item)
                 
                 for item in components_to_remove:
@@ -798,7 +987,14 @@ class ROM_View(discord.ui.View):
 class Search(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.region_ranker = RegionRanker()
+        # Shared with every ROM_View through the bot, like the emoji dictionary
+        self.bot.qr_codes = QRCodeCache(self.bot.config.QR_CACHE_MB * 1024 * 1024)
+        self.bot.qr_triggers = QRTriggerDispatcher()
         self.platform_emoji_names = {}  # Will be populated from API data
+        # platform name -> candidate emoji names, and the reverse, so emoji changes re-map only what they touch
+        self._emoji_candidates: Dict[str, List[str]] = {}
+        self._platforms_by_emoji: Dict[str, set] = {}
         # Map of common platform name variations
         self.platform_variants = {
             '3DO Interactive Multiplayer': ['3do'],
@@ -875,38 +1071,14 @@ class Search(commands.Cog):
         await self.bot.wait_until_ready()
         
         try:
-            # Get platforms from API
-            raw_platforms = await self.bot.fetch_api_endpoint('platforms')
-            if not raw_platforms:
+            # Get platforms from the shared index
+            platform_index = await self.bot.ensure_platform_index()
+            if not platform_index.platforms:
                 print("Warning: Could not fetch platforms for emoji mapping")
                 return
                 
-            sanitized_platforms = self.bot.sanitize_data(raw_platforms, data_type='platforms')
-            mapped_count = 0
-            #print("\nPlatform Emoji Mappings:")
-            
-            for platform in sanitized_platforms:
-                if 'name' in platform:
-                    platform_name = platform['name']
-                    variants = self.platform_variants.get(platform_name, [])
-                    
-                    # Try each variant
-                    mapped = False
-                    for variant in variants:
-                        if variant in self.bot.emoji_dict:
-                            self.platform_emoji_names[platform_name] = variant
-                            #print(f"{platform_name} -> {variant}")
-                            mapped = True
-                            mapped_count += 1
-                            break
-                    
-                    # If no variant worked, try simple name
-                    if not mapped:
-                        simple_name = platform_name.lower().replace(' ', '_').replace('-', '_')
-                        if simple_name in self.bot.emoji_dict:
-                            self.platform_emoji_names[platform_name] = simple_name
-                            #print(f"{platform_name} -> {simple_name}")
-                            mapped_count += 1
+            sanitized_platforms = platform_index.platforms
+            mapped_count = sum(1 for platform in sanitized_platforms if self.map_platform_emoji(platform['name']))
             
             print(f"Successfully mapped {mapped_count} platform(s) to custom emoji(s)")
             
@@ -916,53 +1088,113 @@ class Search(commands.Cog):
                 print("\nUnmapped platforms:")
                 for name in sorted(unmapped):
                     print(f"- {name}")
+
+            # Precompute the emoji display strings every cog reads from the index
+            platform_index.set_display_formatter(self.get_platform_with_emoji)
             
         except Exception as e:
             print(f"Error initializing platform emoji mappings: {e}")
-    
+
+    def emoji_candidates(self, platform_name: str) -> List[str]:
+        """Emoji names that may represent a platform: its known variants, then its simple name."""
+        candidates = self._emoji_candidates.get(platform_name)
+        if candidates is None:
+            simple_name = platform_name.lower().replace(' ', '_').replace('-', '_')
+            candidates = list(dict.fromkeys(self.platform_variants.get(platform_name, []) + [simple_name]))
+            self._emoji_candidates[platform_name] = candidates
+            for name in candidates:
+                self._platforms_by_emoji.setdefault(name, set()).add(platform_name)
+        return candidates
+
+    def map_platform_emoji(self, platform_name: str) -> bool:
+        """Point a platform at the first of its emoji candidates that exists. Returns whether one did."""
+        emoji_dict = getattr(self.bot, 'emoji_dict', {})
+        for variant in self.emoji_candidates(platform_name):
+            if variant in emoji_dict:
+                self.platform_emoji_names[platform_name] = variant
+                return True
+        self.platform_emoji_names.pop(platform_name, None)
+        return False
+
     def get_platform_with_emoji(self, platform_name: str) -> str:
         """Returns platform name with its emoji if available."""
         if not platform_name or not hasattr(self.bot, 'emoji_dict'):
             return platform_name
 
-        # Get the variant names - platform_variants returns a list
-        variant_names = self.platform_variants.get(platform_name, [platform_name.lower().replace(' ', '_').replace('-', '_')])
-
-        # If variant_names is a list (which it should be), use it directly
-        # If somehow it's not a list, wrap it in a list
-        variants_to_check = variant_names if isinstance(variant_names, list) else [variant_names]
+        # Platforms seen for the first time, e.g. after a platform refresh, are mapped once here
+        if platform_name not in self._emoji_candidates:
+            self.map_platform_emoji(platform_name)
 
-        # Try to find a matching custom emoji
-        for variant in variants_to_check:
-            if variant in self.bot.emoji_dict:
-                return f"{platform_name} {self.bot.emoji_dict[variant]}"
+        emoji = self.bot.emoji_dict.get(self.platform_emoji_names.get(platform_name))
+        if emoji:
+            return f"{platform_name} {emoji}"
 
         # If no custom emoji found, use the fallback
         return f"{platform_name} 🎮"
-        
+
+    @commands.Cog.listener()
+    async def on_emoji_dict_update(self, changed_names: Optional[set] = None):
+        """Re-map only the platforms whose emojis were added, renamed or removed."""
+        try:
+            if changed_names is None:
+                platform_names = set(self._emoji_candidates)
+            else:
+                platform_names = set()
+                for name in changed_names:
+                    platform_names |= self._platforms_by_emoji.get(name, set())
+            for platform_name in platform_names:
+                self.map_platform_emoji(platform_name)
+            if platform_names:
+                self.bot.platform_index.refresh_display(platform_names)
+                logger.info(f"Updated emoji for {len(platform_names)} platform(s)")
+        except Exception as e:
+            logger.error(f"Error updating platform emojis: {e}")
 
     async def platform_autocomplete(self, ctx: discord.AutocompleteContext):
         """Autocomplete function for platform names."""
         try:
-            platforms_data = self.bot.cache.get('platforms')
-
-            if not platforms_data:
-                raw_platforms = await self.bot.fetch_api_endpoint('platforms')
-                if raw_platforms:
-                    platforms_data = self.bot.sanitize_data(raw_platforms, data_type='platforms')
-
-            if platforms_data:
-                platform_names = [p.get('name', '') for p in platforms_data if p.get('name')]
+            platform_index = await self.bot.ensure_platform_index()
+            if platform_index.platforms:
                 user_input = ctx.value.lower()
-                return [name for name in platform_names if user_input in name.lower()][:25]
+                return [name for name in platform_index.sorted_names if user_input in name.lower()][:25]
         except Exception as e:
             logger.error(f"Error in platform autocomplete: {e}")
         return []
     
+    async def game_autocomplete(self, ctx: discord.AutocompleteContext):
+        """Autocomplete function for game titles, answered from the local catalog."""
+        try:
+            catalog = self.bot.catalog
+            if not catalog or len(ctx.value.strip()) < 2:
+                return []
+            platform_id = None
+            if platform_option := ctx.options.get('platform'):
+                platform_data = self.bot.platform_index.find(platform_option)
+                if not platform_data:
+                    return []
+                platform_id = platform_data['id']
+            # Discord option values are limited to 100 characters
+            return [title[:100] for title in await catalog.complete_title(ctx.value, platform_id=platform_id)]
+        except Exception as e:
+            logger.error(f"Error in game autocomplete: {e}")
+        return []
+
     @commands.Cog.listener()
     async def on_ready(self):
         """Re-initialize emoji mappings when bot reconnects"""
         await self.initialize_platform_emoji_mappings()
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Route 'qr' replies to the view that owns the replied-to message"""
+        if message.reference and not message.author.bot:
+            await self.bot.qr_triggers.dispatch_message(message)
+
+    @commands.Cog.listener()
+    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
+        """Route QR reactions to the view that owns the message"""
+        if not user.bot:
+            await self.bot.qr_triggers.dispatch_reaction(reaction, user)
     
     @discord.slash_command(name="firmware", description="List firmware files available for a platform")
     async def firmware(self, ctx: discord.ApplicationContext, 
@@ -972,23 +1204,21 @@ class Search(commands.Cog):
         await ctx.defer()
 
         try:
-            raw_platforms = await self.bot.fetch_api_endpoint('platforms')
-            if not raw_platforms:
+            platform_index = await self.bot.ensure_platform_index()
+            if not platform_index.platforms:
                 await ctx.respond("Failed to fetch platforms data")
                 return
 
-            platform_data = None
-            for p in raw_platforms:
-                if platform.lower() in p.get('name', '').lower():
-                    platform_data = p
-                    break
-
+            platform_data = platform_index.find(platform)
             if not platform_data:
-                platforms_list = "\n".join(
-                    f"• {self.get_platform_with_emoji(p.get('name', 'Unknown'))}" 
-                    for p in raw_platforms
+                # Still accept partial names typed without autocomplete
+                platform_data = next(
+                    (p for p in platform_index.platforms if platform.lower() in p['name'].lower()),
+                    None
                 )
-                await ctx.respond(f"Platform '{platform}' not found. Available platforms:\n{platforms_list}")
+
+            if not platform_data:
+                await ctx.respond(f"Platform '{platform}' not found. Available platforms:\n{platform_index.available_list}")
                 return
 
             firmware_data = await self.bot.fetch_api_endpoint(f'firmware?platform_id={platform_data["id"]}')
@@ -1002,7 +1232,7 @@ class Search(commands.Cog):
 
             embeds = []
             current_embed = discord.Embed(
-                title=f"Firmware Files for {self.get_platform_with_emoji(platform_data.get('name', platform))}",
+                title=f"Firmware Files for {platform_index.display(platform_data['name'])}",
                 description=f"Found {len(firmware_data)} firmware file(s) {self.bot.emoji_dict['bios']}",
                 color=discord.Color.blue()
             )
@@ -1063,236 +1293,248 @@ class Search(commands.Cog):
         """Get a random ROM from the collection or a specific platform."""
         await ctx.defer()
         try:
+            platform_index = await self.bot.ensure_platform_index()
+            if not platform_index.platforms:
+                await ctx.respond("❌ Unable to fetch platforms data")
+                return
+
+            platform_data = None
             if platform:
-                # Get platform data
-                raw_platforms = await self.bot.fetch_api_endpoint('platforms')
-                if not raw_platforms:
-                    await ctx.respond("❌ Unable to fetch platforms data")
-                    return
-            
                 # Find matching platform
-                platform_id = None
-                platform_name = None
-                sanitized_platforms = self.bot.sanitize_data(raw_platforms, data_type='platforms')
-            
-                for p in sanitized_platforms:
-                    if p['name'].lower() == platform.lower():
-                        platform_id = p['id']
-                        platform_name = p['name']
-                        rom_count = p['rom_count']
-                        break
-                    
-                if not platform_id:
-                    platforms_list = "\n".join(
-                        f"• {self.get_platform_with_emoji(p['name'])}" 
-                        for p in sorted(sanitized_platforms, key=lambda x: x['name'])
-                    )
-                    await ctx.respond(f"❌ Platform '{platform}' not found. Available platforms:\n{platforms_list}")
+                platform_data = platform_index.find(platform)
+                if not platform_data:
+                    await ctx.respond(f"❌ Platform '{platform}' not found. Available platforms:\n{platform_index.available_list}")
                     return
 
-                if rom_count <= 0:
-                    await ctx.respond(f"❌ No ROMs found for platform '{self.get_platform_with_emoji(platform_name)}'")
+                if platform_data['rom_count'] <= 0:
+                    await ctx.respond(f"❌ No ROMs found for platform '{platform_index.display(platform_data['name'])}'")
                     return
+            elif not any(p['rom_count'] > 0 for p in platform_index.platforms):
+                await ctx.respond("❌ No ROMs found in the collection")
+                return
 
-                # Try up to 5 times to find a valid ROM for the specific platform
-                max_attempts = 5
-                for attempt in range(max_attempts):
-                    try:
-                        # Get ROMs for platform
-                        all_roms = await self.bot.fetch_api_endpoint(
-                            f'roms?platform_id={platform_id}&limit={rom_count}'
-                        )
-                        
-                        if all_roms and isinstance(all_roms, list) and len(all_roms) > 0:
-                            # Select a random ROM from the list
-                            rom_data = random.choice(all_roms)
-                            
-                            # Get full ROM data
-                            detailed_rom = await self.bot.fetch_api_endpoint(f'roms/{rom_data["id"]}')
-                            if detailed_rom:
-                                rom_data = detailed_rom
-                            
-                            # Create view with explicit ROM data
-                            view = ROM_View(self.bot, [rom_data], ctx.author.id, platform_name)
-                            view.remove_item(view.select)
-                            view._selected_rom = rom_data
-                            embed = await view.create_rom_embed(rom_data)
-                            await view.update_file_select(rom_data)
-
-                            initial_message = await ctx.respond(
-                                f"🎲 Found a random ROM from {self.get_platform_with_emoji(platform_name)}:",
-                                embed=embed,
-                                view=view
-                            )
-
-                            if isinstance(initial_message, discord.Interaction):
-                                initial_message = await initial_message.original_response()
-                            
-                            view.message = initial_message
-                            self.bot.loop.create_task(view.watch_for_qr_triggers(ctx.interaction))
-                            return
-
-                    except Exception as e:
-                        logger.error(f"Error in attempt {attempt + 1}: {e}")
-                    
-                    logger.info(f"Random ROM attempt {attempt + 1} for platform {platform_name} failed")
-                    await asyncio.sleep(1)
+            rom_data = await self.sample_rom(platform_data)
+            if not rom_data:
+                await ctx.respond("❌ Failed to find a valid random ROM. Please try again.")
+                return
 
-            else:
-                # Random from full collection
-                stats_data = self.bot.cache.get('stats')
-                if not stats_data or 'Roms' not in stats_data:
-                    await ctx.respond("❌ Unable to fetch collection data")
-                    return
-                
-                total_roms = stats_data['Roms']
-                if total_roms <= 0:
-                    await ctx.respond("❌ No ROMs found in the collection")
-                    return
+            # Get full ROM data
+            detailed_rom = await self.bot.fetch_rom_details(rom_data['id'])
+            if detailed_rom:
+                rom_data = detailed_rom
 
-                # Try up to 5 times to find a valid ROM
-                max_attempts = 5
-                for attempt in range(max_attempts):
-                    random_rom_id = random.randint(1, total_roms)
-                    rom_data = await self.bot.fetch_api_endpoint(f'roms/{random_rom_id}')
-                
-                    if rom_data and isinstance(rom_data, dict) and rom_data.get('id'):
-                        # Get platform name if available
-                        platform_name = None
-                        if platform_id := rom_data.get('platform_id'):
-                            platforms_data = self.bot.cache.get('platforms')
-                            if platforms_data:
-                                for p in platforms_data:
-                                    if p.get('id') == platform_id:
-                                        platform_name = p.get('name')
-                                        break
-
-                        # Create view with explicit ROM data
-                        view = ROM_View(self.bot, [rom_data], ctx.author.id, platform_name)
-                        view.remove_item(view.select)
-                        view._selected_rom = rom_data
-                        embed = await view.create_rom_embed(rom_data)
-                        await view.update_file_select(rom_data)
-
-                        initial_message = await ctx.respond(
-                            f"🎲 Found a random ROM" + (f" from {self.get_platform_with_emoji(platform_name)}" if platform_name else "") + ":",
-                            embed=embed,
-                            view=view
-                        )
-
-                        if isinstance(initial_message, discord.Interaction):
-                            initial_message = await initial_message.original_response()
-                        
-                        view.message = initial_message
-                        self.bot.loop.create_task(view.watch_for_qr_triggers(ctx.interaction))
-                        return
-
-                    logger.info(f"Random ROM attempt {attempt + 1} with ID {random_rom_id} failed")
-                    await asyncio.sleep(1)
-
-            # If all attempts failed
-            await ctx.respond("❌ Failed to find a valid random ROM. Please try again.")
+            platform_name = None
+            if platform := platform_index.get(rom_data.get('platform_id')):
+                platform_name = platform['name']
+
+            # Create view with explicit ROM data
+            view = ROM_View(self.bot, [rom_data], ctx.author.id, platform_name)
+            view.remove_item(view.select)
+            view._selected_rom = RomRecord.from_rom(rom_data)
+            embed = await view.create_rom_embed(rom_data)
+            await view.update_file_select(rom_data)
+
+            initial_message = await ctx.respond(
+                f"🎲 Found a random ROM" + (f" from {platform_index.display(platform_name)}" if platform_name else "") + ":",
+                embed=embed,
+                view=view
+            )
+
+            if isinstance(initial_message, discord.Interaction):
+                initial_message = await initial_message.original_response()
+
+            view.message = initial_message
+            await view.watch_for_qr_triggers(ctx.interaction)
 
         except Exception as e:
             logger.error(f"Error in random command: {e}", exc_info=True)
             await ctx.respond("❌ An error occurred while fetching a random ROM")
 
+    async def sample_rom(self, platform: Optional[Dict] = None) -> Optional[Dict]:
+        """Pick one ROM uniformly at random, from a platform or from the whole collection.
+
+        Without a platform, a platform is drawn with probability proportional to its ROM
+        count first. The ROM is then read at a random position, from the local catalog
+        when it is current and otherwise with a single-item API page, so only one ROM is
+        ever fetched however large the platform is.
+        """
+        if platform is None:
+            candidates = [p for p in self.bot.platform_index.platforms if p['rom_count'] > 0]
+            if not candidates:
+                return None
+            platform = random.choices(candidates, weights=[p['rom_count'] for p in candidates])[0]
+
+        index = random.randrange(platform['rom_count'])
+        catalog = self.bot.catalog
+        if catalog and await catalog.is_fresh(platform['id']):
+            rom = await catalog.rom_at(platform['id'], index)
+            if rom:
+                return rom
+
+        endpoint = f"roms?platform_id={platform['id']}&limit=1&offset={index}"
+        results = await self.bot.fetch_api_endpoint(endpoint, bypass_cache=True)
+        # Random offsets are never asked for twice, don't let them crowd the API cache
+        self.bot.forget_endpoint(endpoint)
+        if isinstance(results, list) and results:
+            return results[0]
+        logger.warning(f"Random pick {index} of platform {platform['name']} returned nothing")
+        return None
+
+    def catalog_page_loader(self, search_term: str, platform_id: Optional[int] = None):
+        """Page loader answering from the local catalog."""
+        async def load(offset: int, limit: int) -> List[Dict]:
+            return await self.bot.catalog.search(search_term, platform_id=platform_id, limit=limit, offset=offset)
+        return load
+
+    def api_page_loader(self, search_term: str, platform_id: int):
+        """Page loader asking RomM for one page at a time."""
+        async def load(offset: int, limit: int) -> List[Dict]:
+            return await self.bot.search_roms(platform_id, search_term, limit=limit, offset=offset)
+        return load
+
+    async def search_all_platforms(self, search_term: str) -> Tuple[List[Dict], List[str]]:
+        """Search every platform at once, locally where the catalog is current and over the API elsewhere.
+
+        API requests run concurrently, bounded by SEARCH_CONCURRENCY, and anything still
+        running after SEARCH_BUDGET seconds is dropped. Returns the merged results and the
+        names of platforms that did not answer in time.
+        """
+        platform_index = self.bot.platform_index
+        catalog = self.bot.catalog
+        results: List[Dict] = []
+
+        fresh = await catalog.fresh_platforms() if catalog else set()
+        if fresh:
+            local_results = await catalog.search(search_term, limit=50)
+            results = [rom for rom in local_results if rom['platform_id'] in fresh]
+
+        # Fan out to the API for platforms the catalog can't vouch for, or everywhere on a local miss
+        remote = [p for p in platform_index.platforms if p['id'] not in fresh or not results]
+        if not remote:
+            return results, []
+
+        semaphore = asyncio.Semaphore(self.bot.config.SEARCH_CONCURRENCY)
+
+        async def search_platform(platform: Dict) -> List[Dict]:
+            async with semaphore:
+                return await self.bot.search_roms(platform['id'], search_term, limit=25)
+
+        tasks = {asyncio.ensure_future(search_platform(p)): p for p in remote}
+        done, pending = await asyncio.wait(tasks, timeout=self.bot.config.SEARCH_BUDGET)
+        for task in pending:
+            task.cancel()
+
+        for task in done:
+            if not task.cancelled() and task.exception() is None:
+                results.extend(task.result())
+        timed_out = [tasks[task]['name'] for task in pending]
+        if timed_out:
+            logger.warning(f"Search for '{search_term}' skipped {len(timed_out)} platform(s) over the time budget")
+        return results, timed_out
+
     @discord.slash_command(name="search", description="Search for a ROM")
     async def search(self, ctx: discord.ApplicationContext,
-                    platform: discord.Option(str, "Platform to search in", 
-                                          required=True,
-                                          autocomplete=platform_autocomplete),
-                    game: discord.Option(str, "Game name to search for", required=True)):
+                    game: discord.Option(str, "Game name to search for", required=True,
+                                      autocomplete=game_autocomplete),
+                    platform: discord.Option(str, "Platform to search in (all platforms if omitted)", 
+                                          required=False,
+                                          default=None,
+                                          autocomplete=platform_autocomplete)):
         """Search for a ROM and provide download options."""
         await ctx.defer()
 
         try:
             # Get platform data
-            raw_platforms = await self.bot.fetch_api_endpoint('platforms')
-            if not raw_platforms:
+            platform_index = await self.bot.ensure_platform_index()
+            if not platform_index.platforms:
                 await ctx.respond("❌ Unable to fetch platforms data")
                 return
             
-            # Find matching platform
             platform_id = None
             platform_name = None
-            sanitized_platforms = self.bot.sanitize_data(raw_platforms, data_type='platforms')
-            
-            for p in sanitized_platforms:
-                if p['name'].lower() == platform.lower():
-                    platform_id = p['id']
-                    platform_name = p['name']
-                    break
-                    
-            if not platform_id:
-                platforms_list = "\n".join(
-                    f"• {self.get_platform_with_emoji(p['name'])}" 
-                    for p in sorted(sanitized_platforms, key=lambda x: x['name'])
-                )
-                await ctx.respond(f"❌ Platform '{platform}' not found. Available platforms:\n{platforms_list}")
-                return
-
-            # Search for ROMs
-            search_term = game.strip()
-            search_results = await self.bot.fetch_api_endpoint(
-                f'roms?platform_id={platform_id}&search_term={search_term}&limit=25'
-            )
-            
-            if not search_results or len(search_results) == 0:
-                search_words = search_term.split()
-                if len(search_words) > 1:
-                    search_term = ' '.join(search_words)
-                    search_results = await self.bot.fetch_api_endpoint(
-                        f'roms?platform_id={platform_id}&search_term={search_term}&limit=25'
-                    )
-
-            if not search_results or not isinstance(search_results, list) or len(search_results) == 0:
-                await ctx.respond(f"No ROMs found matching '{game}' for platform '{platform_name}'")
-                return
+            if platform:
+                # Find matching platform
+                platform_data = platform_index.find(platform)
+                if not platform_data:
+                    await ctx.respond(f"❌ Platform '{platform}' not found. Available platforms:\n{platform_index.available_list}")
+                    return
 
-            # Sort results
-            def sort_roms(rom):
-                game_name = rom['name'].lower()
-                filename = rom.get('file_name', '').upper()
+                platform_id = platform_data['id']
+                platform_name = platform_data['name']
+            scope = f"platform '{platform_index.display(platform_name)}'" if platform_name else "any platform"
+
+            # Search for ROMs, answering from the local catalog while it is current
+            search_term = ' '.join(game.split())
+            page_size = ROM_View.PAGE_SIZE
+            search_results = None
+            page_loader = None
+            timed_out = []
+            catalog = self.bot.catalog
+            if platform_id is None:
+                fresh = await catalog.fresh_platforms() if catalog else set()
+                if fresh and all(p['id'] in fresh for p in platform_index.platforms):
+                    page_loader = self.catalog_page_loader(search_term)
+                    search_results = await page_loader(0, page_size + 1)
+                if not search_results:
+                    page_loader = None
+                    search_results, timed_out = await self.search_all_platforms(search_term)
+            else:
+                if catalog and await catalog.is_fresh(platform_id):
+                    page_loader = self.catalog_page_loader(search_term, platform_id)
+                    search_results = await page_loader(0, page_size + 1)
 
-                if game_name.startswith("the "):
-                    game_name = game_name[4:]
-        
-                if "(USA)" in filename or "(USA, WORLD)" in filename:
-                    if "BETA" in filename or "(PROTOTYPE)" in filename:
-                        file_priority = 2
-                    else:
-                        file_priority = 0
-                elif "(WORLD)" in filename:
-                    if "BETA" in filename or "(PROTOTYPE)" in filename:
-                        file_priority = 3
-                    else:
-                        file_priority = 1
-                elif "BETA" in filename or "(PROTOTYPE)" in filename:
-                    file_priority = 5
-                elif "(DEMO)" in filename or "PROMOTIONAL" in filename or "SAMPLE" in filename or "SAMPLER" in filename:
-                    if "BETA" in filename or "(PROTOTYPE)" in filename:
-                        file_priority = 6
-                    else:
-                        file_priority = 4
-                else:
-                    file_priority = 3
-        
-                return (game_name, file_priority, filename.lower())
+                if not search_results:
+                    page_loader = self.api_page_loader(search_term, platform_id)
+                    search_results = await page_loader(0, page_size + 1)
 
-            search_results.sort(key=sort_roms)
+            suggestions = None
+            if not search_results or not isinstance(search_results, list) or len(search_results) == 0:
+                # Nothing matched as typed, look for close spellings in the local catalog
+                if catalog:
+                    suggestions = await catalog.fuzzy_search(search_term, platform_id=platform_id, limit=10)
+                if not suggestions:
+                    await ctx.respond(f"No ROMs found matching '{game}' for {scope}")
+                    return
+                search_results = suggestions
+
+            # Suggestions stay in similarity order, matches from every platform share one ranking
+            sort_key = self.region_ranker.key_for(ctx.guild_id)
+            has_more = False
+            if not suggestions:
+                if page_loader:
+                    # One extra row was requested to learn whether a next page exists
+                    has_more = len(search_results) > page_size
+                    search_results = search_results[:page_size]
+                search_results.sort(key=sort_key)
+                search_results = search_results[:page_size]
 
             # Create initial message
-            if len(search_results) >= 25:
+            if suggestions:
+                suggested_names = list(dict.fromkeys(rom['name'] for rom in suggestions))[:5]
+                initial_content = (
+                    f"No ROMs found matching '{game}' for {scope}. "
+                    f"Did you mean:\n" + "\n".join(f"• {name}" for name in suggested_names)
+                )
+            elif has_more:
                 initial_content = (
-                    f"Found 25+ ROMs matching '{game}' for platform '{self.get_platform_with_emoji(platform_name)}'. "
+                    f"Found 25+ ROMs matching '{game}' for {scope}. "
+                    f"Showing the first 25, use the buttons below to browse more:"
+                )
+            elif len(search_results) >= 25:
+                initial_content = (
+                    f"Found 25+ ROMs matching '{game}' for {scope}. "
                     f"Showing first 25 results.\nPlease refine your search terms for more specific results:"
                 )
             else:
-                initial_content = f"Found {len(search_results)} ROMs matching '{game}' for platform '{self.get_platform_with_emoji(platform_name)}':"
+                initial_content = f"Found {len(search_results)} ROMs matching '{game}' for {scope}:"
+            if timed_out:
+                initial_content += f"\n⚠️ {len(timed_out)} platform(s) took too long to answer and were skipped"
 
             # Create view first
-            view = ROM_View(self.bot, search_results, ctx.author.id, platform_name)
+            view = ROM_View(
+                self.bot, search_results, ctx.author.id, platform_name,
+                page_loader=page_loader if has_more else None, has_more=has_more, sort_key=sort_key
+            )
             
             # Send message exactly like random command
             initial_message = await ctx.respond(
@@ -1311,5 +1553,56 @@ class Search(commands.Cog):
             logger.error(f"Error in search command: {e}", exc_info=True)
             await ctx.respond("❌ An error occurred while searching for ROMs")
 
+    @discord.slash_command(name="region_priority", description="Choose which regions this server's search results list first")
+    @commands.has_permissions(administrator=True)
+    async def region_priority(self, ctx: discord.ApplicationContext,
+                              regions: discord.Option(str, "Regions in order of preference, e.g. Europe, World, USA ('default' to reset)",
+                                                      required=False, default=None),
+                              revision: discord.Option(str, "Which revision of a game to list first",
+                                                       required=False, default=None,
+                                                       choices=list(REVISION_CHOICES))):
+        """Show or change the region and revision order used to sort search results."""
+        try:
+            guild_id = ctx.guild_id
+            current = self.region_ranker.preference(guild_id)
+
+            if regions is None and revision is None:
+                await ctx.respond(f"🌍 Search results are ordered by region: {current.describe()}", ephemeral=True)
+                return
+
+            if regions and regions.strip().lower() == 'default':
+                self.region_ranker.reset(guild_id)
+                await ctx.respond(f"✅ Region order reset to the default: {DEFAULT_PREFERENCE.describe()}", ephemeral=True)
+                return
+
+            region_codes = list(current.regions)
+            if regions:
+                region_codes = []
+                unknown = []
+                for name in regions.split(','):
+                    if not name.strip():
+                        continue
+                    code = normalize_region(name)
+                    if code:
+                        region_codes.append(code)
+                    else:
+                        unknown.append(name.strip())
+                if unknown:
+                    await ctx.respond(f"❌ Unknown region(s): {', '.join(unknown)}", ephemeral=True)
+                    return
+
+            preference = self.region_ranker.set_preference(guild_id, region_codes, revision or current.revision)
+            logger.info(f"Region priority for guild {guild_id} set to {preference.describe()}")
+            await ctx.respond(f"✅ Search results will now be ordered by region: {preference.describe()}", ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error in region_priority command: {e}", exc_info=True)
+            await ctx.respond("❌ An error occurred while updating the region priority", ephemeral=True)
+
+    def cog_unload(self):
+        """Clean up when the cog is unloaded."""
+        self.bot.qr_codes.close()
+        self.bot.qr_triggers.close()
+
 def setup(bot):
     bot.add_cog(Search(bot))
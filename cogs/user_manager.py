@@ -287,13 +287,12 @@ class UserManager(commands.Cog):
             return f"user_{str(hash(display_name))[-8:]}"
             
         # Check if username exists and make unique if needed
-        users = await self.bot.fetch_api_endpoint('users')
-        if users:
-            existing_usernames = [user.get('username', '') for user in users]
+        user_index = await self.bot.ensure_user_index()
+        if user_index:
             original_username = username
             counter = 1
             
-            while username in existing_usernames:
+            while user_index.has_username(username):
                 username = f"{original_username}_{counter}"
                 counter += 1
         
@@ -339,7 +338,10 @@ class UserManager(commands.Cog):
                 if response.status == 401:  # Unauthorized - token might be expired
                     if await self.get_oauth_token():  # Try refreshing token
                         return await self.delete_user(user_id)  # Retry once
-                return response.status == 200
+                if response.status == 200:
+                    self.bot.user_index.remove(user_id)
+                    return True
+                return False
         except Exception as e:
             logger.error(f"Error deleting user {user_id}: {e}", exc_info=True)
             return False
@@ -368,6 +370,8 @@ class UserManager(commands.Cog):
                     users = await response.json()
                     logger.info(f"Searching for user with username: {username}")
                     if users:
+                        # We hold the full listing anyway, so keep the local index current
+                        self.bot.user_index.rebuild(users)
                         # Log all usernames for debugging
                         logger.info(f"Available usernames: {[user.get('username', '') for user in users]}")
                         return next(
@@ -702,6 +706,7 @@ class UserManager(commands.Cog):
 
                 if response.status in (200, 201):
                     response_data = await response.json()
+                    self.bot.user_index.add(response_data)
                     
                     # Store link in database
                     await self.db_manager.add_user_link(